@@ -6,3 +6,7 @@ class AppConfig(AppConfig):
     
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        """Registra los receptores de señales de la aplicación"""
+        from . import signals  # noqa: F401
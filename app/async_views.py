@@ -0,0 +1,429 @@
+"""
+Versiones asíncronas de las vistas de listado, formulario y eliminación.
+
+Se usan con el servidor ASGI (ver app/urls_async.py): las lecturas se hacen
+con la API asíncrona del ORM, de modo que un proceso atiende muchas conexiones
+lentas sin ocupar un hilo por cada una. Las altas y modificaciones reutilizan
+los métodos save_*/update_* de los modelos a través de sync_to_async, que es lo
+mismo que hacen acreate() y asave() en esta versión de Django.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.db.models import Prefetch
+from django.http import Http404
+from django.shortcuts import aget_object_or_404, redirect, render, reverse
+from django.views.decorators.http import require_POST
+
+from .cache import acached_paginate, conditional_page
+from .filters import (
+    CLIENT_FILTERS,
+    MEDICINE_FILTERS,
+    PET_FILTERS,
+    PRODUCT_FILTERS,
+    VET_FILTERS,
+)
+from .models import Breed, City, Client, Medicine, Pet, Product, Provider, Vet
+from .pickers import apicker_choices
+from .validation import parse_digits
+from .views import posted_id
+
+
+async def adelete_by_ids(model, ids, missing_404=False):
+    """Elimina con un único DELETE filtrado las filas con los ids indicados"""
+    # QuerySet.delete() ya ejecuta el borrado dentro de una transacción
+    _, deleted = await model.objects.filter(pk__in=ids).adelete()
+
+    count = deleted.get(model._meta.label, 0)
+    if missing_404 and count == 0:
+        raise Http404("No existe el registro a eliminar")
+    return count
+
+
+async def abulk_delete(request, model, label, repository):
+    """Elimina los ids enviados en el formulario e informa cuántos se eliminaron"""
+    # Los valores que no son ids (o no entran en la columna) se descartan
+    ids = [pk for pk in map(parse_digits, request.POST.getlist("ids")) if pk is not None]
+    count = await adelete_by_ids(model, ids) if ids else 0
+    messages.success(request, f"Se eliminaron {count} {label}")
+
+    return redirect(reverse(repository))
+
+
+@conditional_page(Client)
+async def clients_repository(request):
+    """Renderiza la página con la lista de clientes."""
+    filters = CLIENT_FILTERS.apply(Client.objects.all(), request.GET)
+    page = await acached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "clients/repository.html",
+        {
+            "clients": page.object_list,
+            "page": page,
+            "filters": filters,
+            "cities": City.choices,
+        },
+    )
+
+
+@conditional_page(Client, Pet)
+async def clients_detail(request, id):
+    """Renderiza la ficha de un cliente con la lista de sus mascotas."""
+    client = await aget_object_or_404(
+        Client.objects.prefetch_related(
+            Prefetch("pets", queryset=Pet.objects.order_by("name")),
+        ),
+        pk=id,
+    )
+    return render(request, "clients/detail.html", {"client": client, "pets": client.pets.all()})
+
+
+@conditional_page(Client)
+async def clients_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar clientes."""
+    if request.method == "POST":
+        client_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if client_id == "":
+            saved, errors = await sync_to_async(Client.save_client)(request.POST)
+        else:
+            client = await aget_object_or_404(Client, pk=client_id)
+            saved, errors = await sync_to_async(client.update_client)(request.POST)
+
+        if saved:
+            return redirect(reverse("clients_repo"))
+
+        return render(
+            request, "clients/form.html", {
+                "errors": errors,
+                "client": request.POST,
+                "cities": City.choices,
+            },
+        )
+
+    client = None
+    if id is not None:
+        client = await aget_object_or_404(Client, pk=id)
+
+    return render(
+        request,
+        "clients/form.html",
+        {
+            "client": client,
+            "cities": City.choices,
+        },
+    )
+
+
+async def clients_delete(request):
+    """Elimina un cliente y redirige al repositorio de clientes."""
+    await adelete_by_ids(Client, [posted_id(request, "client_id")], missing_404=True)
+
+    return redirect(reverse("clients_repo"))
+
+
+@require_POST
+async def clients_bulk_delete(request):
+    """Elimina los clientes seleccionados y redirige al repositorio."""
+    return await abulk_delete(request, Client, "clientes", "clients_repo")
+
+
+async def aowner_choices(query="", selected=()):
+    """Retorna los clientes que coinciden con la búsqueda como opciones (id, nombre)"""
+    return await apicker_choices(
+        Client.objects.all(), ("name",), query, selected, search_kind="client",
+    )
+
+
+@conditional_page(Pet, Client)
+async def pets_repository(request):
+    """Renderiza la página con la lista de mascotas y sus dueños."""
+    filters = PET_FILTERS.apply(Pet.objects.select_related("owner"), request.GET)
+    page = await acached_paginate(
+        request, filters.queryset, key=filters.sort, depends_on=(Client,),
+    )
+    return render(
+        request,
+        "pets/repository.html",
+        {
+            "pets": page.object_list,
+            "page": page,
+            "filters": filters,
+            "breeds": Breed.choices,
+        },
+    )
+
+
+@conditional_page(Pet, Client)
+async def pets_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar mascotas."""
+    if request.method == "POST":
+        pet_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if pet_id == "":
+            saved, errors = await sync_to_async(Pet.save_pet)(request.POST)
+        else:
+            pet = await aget_object_or_404(Pet, pk=pet_id)
+            await sync_to_async(pet.update_pet)(request.POST)
+
+        if saved:
+            return redirect(reverse("pets_repo"))
+
+        return render(
+            request, "pets/form.html", {
+                "errors": errors,
+                "pet": request.POST,
+                "breeds": Breed.choices,
+                "owners": await aowner_choices(
+                    request.POST.get("owner_search", ""), [request.POST.get("owner", "")],
+                ),
+                "owner": request.POST.get("owner", ""),
+            },
+        )
+
+    # Al buscar un dueño se conservan los datos ya cargados en el formulario
+    pet = request.GET if "owner_search" in request.GET else None
+    owner = request.GET.get("owner", "")
+    if id is not None and pet is None:
+        pet = await aget_object_or_404(Pet, pk=id)
+        owner = str(pet.owner_id or "")
+
+    return render(
+        request,
+        "pets/form.html",
+        {
+            "pet": pet,
+            "breeds": Breed.choices,
+            "owners": await aowner_choices(request.GET.get("owner_search", ""), [owner]),
+            "owner": owner,
+        },
+    )
+
+
+async def pets_delete(request):
+    """Elimina una mascota y redirige al repositorio de mascotas."""
+    await adelete_by_ids(Pet, [posted_id(request, "pet_id")], missing_404=True)
+
+    return redirect(reverse("pets_repo"))
+
+
+@require_POST
+async def pets_bulk_delete(request):
+    """Elimina las mascotas seleccionadas y redirige al repositorio."""
+    return await abulk_delete(request, Pet, "mascotas", "pets_repo")
+
+
+@conditional_page(Medicine)
+async def medicines_repository(request):
+    """Renderiza la página con la lista de medicamentos."""
+    filters = MEDICINE_FILTERS.apply(Medicine.objects.all(), request.GET)
+    page = await acached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "medicines/repository.html",
+        {"medicines": page.object_list, "page": page, "filters": filters},
+    )
+
+
+@conditional_page(Medicine)
+async def medicines_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar medicamentos."""
+    if request.method == "POST":
+        medicine_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if medicine_id == "":
+            saved, errors = await sync_to_async(Medicine.save_medicine)(request.POST)
+        else:
+            medicine = await aget_object_or_404(Medicine, pk=medicine_id)
+            await sync_to_async(medicine.update_medicine)(request.POST)
+
+        if saved:
+            return redirect(reverse("medicines_repo"))
+
+        return render(
+            request, "medicines/form.html", {"errors": errors, "medicine": request.POST},
+        )
+
+    medicine = None
+    if id is not None:
+        medicine = await aget_object_or_404(Medicine, pk=id)
+
+    return render(request, "medicines/form.html", {"medicine": medicine})
+
+
+async def medicines_delete(request):
+    """Elimina un medicamento y redirige al repositorio de medicamentos."""
+    await adelete_by_ids(Medicine, [posted_id(request, "medicine_id")], missing_404=True)
+
+    return redirect(reverse("medicines_repo"))
+
+
+@require_POST
+async def medicines_bulk_delete(request):
+    """Elimina los medicamentos seleccionados y redirige al repositorio."""
+    return await abulk_delete(request, Medicine, "medicamentos", "medicines_repo")
+
+
+@conditional_page(Provider)
+async def providers_repository(request):
+    """Renderiza la página con la lista de proveedores."""
+    page = await acached_paginate(request, Provider.objects.all())
+    return render(
+        request,
+        "providers/repository.html",
+        {"providers": page.object_list, "page": page},
+    )
+
+
+@conditional_page(Provider)
+async def providers_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar proveedores."""
+    if request.method == "POST":
+        provider_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if provider_id == "":
+            saved, errors = await sync_to_async(Provider.save_provider)(request.POST)
+        else:
+            provider = await aget_object_or_404(Provider, pk=provider_id)
+            await sync_to_async(provider.update_provider)(request.POST)
+
+        if saved:
+            return redirect(reverse("providers_repo"))
+
+        return render(
+            request, "providers/form.html", {"errors": errors, "provider": request.POST},
+        )
+
+    provider = None
+    if id is not None:
+        provider = await aget_object_or_404(Provider, pk=id)
+
+    return render(request, "providers/form.html", {"provider": provider})
+
+
+async def providers_delete(request):
+    """Elimina un proveedor y redirige al repositorio de proveedores."""
+    await adelete_by_ids(Provider, [posted_id(request, "provider_id")], missing_404=True)
+
+    return redirect(reverse("providers_repo"))
+
+
+@require_POST
+async def providers_bulk_delete(request):
+    """Elimina los proveedores seleccionados y redirige al repositorio."""
+    return await abulk_delete(request, Provider, "proveedores", "providers_repo")
+
+
+@conditional_page(Product)
+async def products_repository(request):
+    """Renderiza la página con la lista de productos."""
+    filters = PRODUCT_FILTERS.apply(Product.objects.all(), request.GET)
+    page = await acached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "products/repository.html",
+        {"products": page.object_list, "page": page, "filters": filters},
+    )
+
+
+@conditional_page(Product)
+async def products_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar productos."""
+    if request.method == "POST":
+        product_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if product_id == "":
+            saved, errors = await sync_to_async(Product.save_product)(request.POST)
+        else:
+            product = await aget_object_or_404(Product, pk=product_id)
+            saved, errors = await sync_to_async(product.update_product)(request.POST)
+
+        if saved:
+            return redirect(reverse("products_repo"))
+
+        return render(
+            request, "products/form.html", {"errors": errors, "product": request.POST},
+        )
+
+    product = None
+    if id is not None:
+        product = await aget_object_or_404(Product, pk=id)
+
+    return render(request, "products/form.html", {"product": product})
+
+
+async def products_delete(request):
+    """Elimina un producto y redirige al repositorio de productos."""
+    await adelete_by_ids(Product, [posted_id(request, "product_id")], missing_404=True)
+
+    return redirect(reverse("products_repo"))
+
+
+@require_POST
+async def products_bulk_delete(request):
+    """Elimina los productos seleccionados y redirige al repositorio."""
+    return await abulk_delete(request, Product, "productos", "products_repo")
+
+
+@conditional_page(Vet)
+async def vets_repository(request):
+    """Renderiza la página con la lista de veterinarios."""
+    filters = VET_FILTERS.apply(Vet.objects.all(), request.GET)
+    page = await acached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "vets/repository.html",
+        {"vets": page.object_list, "page": page, "filters": filters},
+    )
+
+
+@conditional_page(Vet)
+async def vets_form(request, id=None):
+    """Renderiza y maneja el formulario para crear o editar veterinarios."""
+    if request.method == "POST":
+        vet_id = request.POST.get("id", "")
+        errors = {}
+        saved = True
+
+        if vet_id == "":
+            saved, errors = await sync_to_async(Vet.save_vet)(request.POST)
+        else:
+            vet = await aget_object_or_404(Vet, pk=vet_id)
+            await sync_to_async(vet.update_vet)(request.POST)
+
+        if saved:
+            return redirect(reverse("vets_repo"))
+
+        return render(
+            request, "vets/form.html", {"vet_errors": errors, "vet": request.POST},
+        )
+
+    vet = None
+    if id is not None:
+        vet = await aget_object_or_404(Vet, pk=id)
+
+    return render(request, "vets/form.html", {"vet": vet})
+
+
+async def vets_delete(request):
+    """Elimina un veterinario y redirige al repositorio de veterinarios."""
+    await adelete_by_ids(Vet, [posted_id(request, "vet_id")], missing_404=True)
+
+    return redirect(reverse("vets_repo"))
+
+
+@require_POST
+async def vets_bulk_delete(request):
+    """Elimina los veterinarios seleccionados y redirige al repositorio."""
+    return await abulk_delete(request, Vet, "veterinarios", "vets_repo")
@@ -0,0 +1,158 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.http import urlencode
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .pagination import apaginate, paginate
+from .routers import reading_from_replica
+
+# Alias de la caché de los listados (ver CACHES en la configuración)
+REPOSITORY_CACHE = "repository"
+
+
+def _cache():
+    return caches[REPOSITORY_CACHE]
+
+
+def _version_key(model):
+    return f"version:{model._meta.label_lower}"
+
+
+def model_versions(*models):
+    """
+    Retorna la versión vigente de cada modelo, creándola si no existe.
+
+    La versión es un valor aleatorio que cambia con cada escritura; las páginas
+    se guardan bajo las versiones de sus modelos, de modo que invalidar consiste
+    en cambiar la versión y las entradas viejas expiran solas por LRU o TIMEOUT.
+    Si la versión se desaloja de la caché se genera otra nueva, nunca se vuelve
+    a una anterior, por lo que no reaparecen páginas desactualizadas.
+    """
+    cache = _cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, timeout=None)
+        versions.update(cache.get_many(list(missing)))
+
+    return [versions.get(key) or missing[key] for key in keys]
+
+
+def invalidate(*models):
+    """Invalida las páginas en caché de los modelos indicados"""
+    _cache().set_many(
+        {_version_key(model): uuid.uuid4().hex for model in models},
+        timeout=None,
+    )
+
+
+def _request_digest(request, *extra):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw = "\n".join([f"{request.path}?{query}", *extra])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _page_key(request, versions):
+    return f"page:{_request_digest(request)}:{'.'.join(versions)}"
+
+
+def _page_timeout():
+    # Una réplica puede estar atrasada respecto de la versión vigente: lo leído
+    # de ella se conserva solo REPLICA_PIN_SECONDS para acotar el desfasaje
+    if reading_from_replica():
+        return settings.REPLICA_PIN_SECONDS
+    return DEFAULT_TIMEOUT
+
+
+def _replica_window():
+    # Ventana de tiempo que se agrega al ETag de las páginas leídas de réplicas
+    if not reading_from_replica():
+        return ""
+    return str(int(time.time()) // max(settings.REPLICA_PIN_SECONDS, 1))
+
+
+def cached_paginate(request, queryset, key="id", depends_on=()):
+    """
+    Igual que paginate, pero guarda la página en la caché de listados.
+
+    La clave combina la ruta, el query string completo (filtros, orden y cursor)
+    y la versión del modelo del queryset y de los modelos de `depends_on`. Se
+    guarda la página y no el HTML, que incluye el token CSRF de cada usuario.
+    """
+    versions = model_versions(queryset.model, *depends_on)
+    cache_key = _page_key(request, versions)
+
+    page = _cache().get(cache_key)
+    if page is None:
+        page = paginate(request, queryset, key=key)
+        _cache().set(cache_key, page, _page_timeout())
+
+    return page
+
+
+async def acached_paginate(request, queryset, key="id", depends_on=()):
+    """
+    Versión asíncrona de cached_paginate.
+
+    Solo la consulta a la base es asíncrona: la caché (memoria o archivos) se
+    consulta directamente, ya que sus variantes async delegan en un hilo.
+    """
+    versions = model_versions(queryset.model, *depends_on)
+    cache_key = _page_key(request, versions)
+
+    page = _cache().get(cache_key)
+    if page is None:
+        page = await apaginate(request, queryset, key=key)
+        _cache().set(cache_key, page, _page_timeout())
+
+    return page
+
+
+def page_etag(*models):
+    """
+    Crea la función que calcula el ETag de una página que muestra `models`.
+
+    El ETag depende de la URL, de la versión de los modelos y del secreto CSRF
+    de la cookie, ya que el HTML incluye un token derivado de él. No se genera
+    ETag (y la página se renderiza siempre) si no es un GET, si el navegador
+    todavía no tiene la cookie CSRF o si hay mensajes pendientes de mostrar.
+    """
+    def etag(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return None
+
+        csrf_secret = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        if not csrf_secret or len(get_messages(request)):
+            return None
+
+        return _request_digest(
+            request, csrf_secret, _replica_window(), *model_versions(*models),
+        )
+
+    return etag
+
+
+def conditional_page(*models):
+    """
+    Responde 304 Not Modified a los GET cuyo If-None-Match coincide con el ETag.
+
+    La comparación ocurre antes de ejecutar la vista, así que una página sin
+    cambios cuesta una lectura de versiones en la caché. Cache-Control
+    private/no-cache obliga al navegador a revalidar en cada navegación y evita
+    que un proxy compartido guarde páginas con el token CSRF.
+    """
+    def decorator(view):
+        view = condition(etag_func=page_etag(*models))(view)
+        return cache_control(private=True, no_cache=True)(view)
+
+    return decorator
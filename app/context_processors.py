@@ -1,7 +1,9 @@
+from types import MappingProxyType
+
 from django.urls import reverse
 
 # agregamos un nuevo contexto para el navbar de mascotas
-links = [
+links = (
     {"label": "Home", "href": reverse("home"), "icon": "bi bi-house-door"},
     {"label": "Clientes", "href": reverse(
         "clients_repo"), "icon": "bi bi-people"},
@@ -15,20 +17,36 @@ links = [
         "medicines_repo"), "icon": "bi bi-capsule-pill"},  # Nuevo enlace para medicamentos
     {"label": "Mascotas", "href": reverse(
         "pets_repo"), "icon": "bi bi-heart-fill"},
+    {"label": "Turnos", "href": reverse(
+        "appointments_repo"), "icon": "bi bi-calendar-check"},
+    {"label": "Ventas", "href": reverse(
+        "invoices_repo"), "icon": "bi bi-receipt"},
+    {"label": "Importar", "href": reverse(
+        "import"), "icon": "bi bi-upload"},
+)
 
-]
 
+def _section(path):
+    """Retorna el primer segmento de la ruta ("" para la página de inicio)"""
+    return path.split("/", 2)[1]
 
-def navbar(request):
-    """Genera los enlaces de navegación y agrega la clase "active" al enlace correspondiente basado en la ruta actual"""
-    def add_active(link):
-        copy = link.copy()
 
-        if copy["href"] == "/":
-            copy["active"] = request.path == "/"
-        else:
-            copy["active"] = request.path.startswith(copy.get("href", ""))
+def _variant(active_section):
+    """Arma los enlaces (inmutables) con "active" marcado para una sección"""
+    return tuple(
+        MappingProxyType({**link, "active": _section(link["href"]) == active_section})
+        for link in links
+    )
+
 
-        return copy
+# Variantes del navbar calculadas una sola vez: sección -> enlaces. Las rutas
+# que no corresponden a ningún enlace usan la variante sin enlace activo.
+NAVBAR_VARIANTS = MappingProxyType({
+    _section(link["href"]): _variant(_section(link["href"])) for link in links
+})
+INACTIVE_NAVBAR = _variant(None)
 
-    return {"links": map(add_active, links)}
+
+def navbar(request):
+    """Genera los enlaces de navegación y agrega la clase "active" al enlace correspondiente basado en la ruta actual"""
+    return {"links": NAVBAR_VARIANTS.get(_section(request.path_info), INACTIVE_NAVBAR)}
@@ -0,0 +1,69 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Modelos exportables: nombre -> (modelo, columnas exportadas en orden)
+EXPORTS = {
+    "clients": (Client, ("id", "name", "phone", "email", "city")),
+    "pets": (Pet, ("id", "name", "breed", "birthday")),
+    "products": (Product, ("id", "name", "type", "price", "stock")),
+    "providers": (Provider, ("id", "name", "email", "address")),
+    "vets": (Vet, ("id", "name", "phone", "email", "address", "speciality")),
+    "medicines": (Medicine, ("id", "name", "description", "dose", "stock")),
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class _EchoBuffer:
+    """Buffer mínimo que devuelve lo escrito para usar csv.writer en un generador"""
+
+    def write(self, value):
+        """Retorna el valor en lugar de almacenarlo"""
+        return value
+
+
+def export_rows(name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Itera las filas de un modelo como tuplas, ordenadas por id.
+
+    Usa un cursor del lado del servidor (iterator) de modo que la memoria no
+    crece con el tamaño de la tabla.
+    """
+    model, fields = EXPORTS[name]
+    queryset = model.objects.order_by("id").values_list(*fields)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_csv(name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Genera el export CSV de un modelo línea por línea, comenzando por el encabezado"""
+    _, fields = EXPORTS[name]
+    writer = csv.writer(_EchoBuffer())
+
+    yield writer.writerow(fields)
+    for row in export_rows(name, chunk_size):
+        yield writer.writerow(row)
+
+
+def iter_ndjson(name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Genera el export NDJSON de un modelo, un objeto JSON por línea"""
+    _, fields = EXPORTS[name]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    for row in export_rows(name, chunk_size):
+        yield encoder.encode(dict(zip(fields, row))) + "\n"
+
+
+def iter_export(name, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Retorna el generador del export en el formato pedido"""
+    if export_format == "csv":
+        return iter_csv(name, chunk_size)
+    return iter_ndjson(name, chunk_size)
+
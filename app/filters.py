@@ -0,0 +1,123 @@
+from django.core.exceptions import ValidationError
+
+from .models import Client, Medicine, Pet, Product, Vet
+
+# Límite superior para convertir un filtro por prefijo en un rango indexable
+PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+class FilterResult:
+    """Resultado de aplicar los filtros de un listado a un queryset"""
+
+    def __init__(self, queryset, sort, values, errors):
+        self.queryset = queryset
+        self.sort = sort
+        self.values = values
+        self.errors = errors
+
+
+class RepositoryFilter:
+    """
+    Describe los filtros y órdenes admitidos por la página de un modelo.
+
+    Cada filtro asocia un parámetro del query string con un campo y un tipo de
+    comparación ("exact", "prefix", "gte" o "lte"). Todos se traducen a
+    igualdades o rangos para que la base de datos use los índices del modelo.
+    Un filtro por rango fija el orden en su propio campo, de modo que el rango y
+    el orden se resuelven con el mismo índice en lugar de recorrer la tabla.
+    """
+
+    def __init__(self, model, filters, sorts=("id",)):
+        self.model = model
+        self.filters = filters
+        self.sorts = sorts
+
+    def _lookups(self, field_name, kind, value):
+        if kind == "exact":
+            return {field_name: value}
+        if kind == "prefix":
+            return {
+                f"{field_name}__gte": value,
+                f"{field_name}__lt": value + PREFIX_UPPER_BOUND,
+            }
+        return {f"{field_name}__{kind}": value}
+
+    def apply(self, queryset, params):
+        """Filtra y define el orden del queryset según el query string"""
+        values = {}
+        errors = {}
+        lookups = {}
+        range_field = None
+
+        for param, (field_name, kind) in self.filters.items():
+            raw = params.get(param, "").strip()
+            if raw == "":
+                continue
+
+            values[param] = raw
+            field = self.model._meta.get_field(field_name)
+            try:
+                value = field.to_python(raw)
+            except ValidationError:
+                errors[param] = "Valor de filtro inválido"
+                continue
+
+            lookups.update(self._lookups(field_name, kind, value))
+            if kind != "exact" and range_field is None:
+                range_field = field_name
+
+        sort = params.get("sort", "")
+        if range_field in self.sorts:
+            sort = range_field
+        elif sort not in self.sorts:
+            sort = self.sorts[0]
+        values["sort"] = sort
+
+        return FilterResult(queryset.filter(**lookups), sort, values, errors)
+
+
+CLIENT_FILTERS = RepositoryFilter(
+    Client,
+    {
+        "city": ("city", "exact"),
+        "name": ("name", "prefix"),
+        "email": ("email", "exact"),
+    },
+    sorts=("id", "name"),
+)
+
+PET_FILTERS = RepositoryFilter(
+    Pet,
+    {
+        "breed": ("breed", "exact"),
+        "birthday_from": ("birthday", "gte"),
+        "birthday_to": ("birthday", "lte"),
+    },
+    sorts=("id", "birthday"),
+)
+
+PRODUCT_FILTERS = RepositoryFilter(
+    Product,
+    {
+        "type": ("type", "exact"),
+        "price_min": ("price", "gte"),
+        "price_max": ("price", "lte"),
+    },
+    sorts=("id", "price"),
+)
+
+VET_FILTERS = RepositoryFilter(
+    Vet,
+    {
+        "speciality": ("speciality", "exact"),
+    },
+    sorts=("id", "name"),
+)
+
+MEDICINE_FILTERS = RepositoryFilter(
+    Medicine,
+    {
+        "dose": ("dose", "exact"),
+    },
+    sorts=("id", "dose"),
+)
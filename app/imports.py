@@ -0,0 +1,144 @@
+import csv
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .cache import invalidate
+from .dashboard import record_created
+from .models import (
+    CLIENT_SCHEMA,
+    MEDICINE_SCHEMA,
+    PET_SCHEMA,
+    PRODUCT_SCHEMA,
+    PROVIDER_SCHEMA,
+    VET_SCHEMA,
+    Client,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    Vet,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Cantidad máxima de errores que se conservan en el reporte
+MAX_REPORTED_ERRORS = 1000
+
+
+def _vet_data(row):
+    # El formulario de veterinarios envía la especialidad como "especialidad"
+    return {**row, "especialidad": row.get("speciality", "")}
+
+
+# Modelos importables: nombre -> (modelo, esquema de validación, columnas, adaptador)
+IMPORTS = {
+    "clients": (Client, CLIENT_SCHEMA, ("name", "phone", "email", "city"), None),
+    "pets": (Pet, PET_SCHEMA, ("name", "breed", "birthday"), None),
+    "products": (Product, PRODUCT_SCHEMA, ("name", "type", "price"), None),
+    "providers": (Provider, PROVIDER_SCHEMA, ("name", "email", "address"), None),
+    "vets": (
+        Vet, VET_SCHEMA, ("name", "phone", "email", "address", "speciality"), _vet_data,
+    ),
+    "medicines": (Medicine, MEDICINE_SCHEMA, ("name", "description", "dose"), None),
+}
+
+
+class ImportReport:
+    """Resumen de una importación: filas leídas, creadas y errores por fila"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        """Registra los errores de validación de una línea del archivo"""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, errors))
+
+
+def _build_instance(model, columns, row):
+    """
+    Convierte los valores de la fila al tipo de cada campo del modelo y aplica
+    sus validadores (largo máximo, rango de los enteros), que el esquema de los
+    formularios no revisa y que bulk_create rechazaría para todo el lote.
+    """
+    values = {}
+    errors = {}
+    for column in columns:
+        field = model._meta.get_field(column)
+        raw = row.get(column) or ""
+        if raw == "" and field.blank:
+            values[column] = field.get_default()
+            continue
+        try:
+            values[column] = field.clean(raw, None)
+        except ValidationError as error:
+            errors[column] = " ".join(error.messages)
+
+    return model(**values), errors
+
+
+def _flush(model, batch, report):
+    if not batch:
+        return
+    # bulk_create no envía post_save: se actualizan a mano la caché y el dashboard
+    with transaction.atomic():
+        model.objects.bulk_create(batch)
+        record_created(model, batch)
+        transaction.on_commit(lambda: invalidate(model))
+    report.created += len(batch)
+    batch.clear()
+
+
+def _errors_by_row(column_errors):
+    rows = {}
+    for field, messages in column_errors.items():
+        for index, message in messages.items():
+            rows.setdefault(index, {})[field] = message
+    return rows
+
+
+def import_rows(name, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Valida e inserta filas (diccionarios) del modelo indicado.
+
+    Las filas se procesan en lotes de `batch_size`: cada lote se valida de una
+    vez con el mismo esquema que usan los formularios, las filas válidas se
+    insertan con bulk_create en una transacción y las inválidas se informan con
+    su número de línea.
+    """
+    model, schema, columns, adapt = IMPORTS[name]
+    report = ImportReport()
+    batch = []
+
+    # La línea 1 del archivo es el encabezado
+    numbered = enumerate(rows, start=2)
+    while chunk := list(islice(numbered, batch_size)):
+        report.rows += len(chunk)
+        data = [adapt(row) if adapt else row for _, row in chunk]
+        chunk_errors = _errors_by_row(schema.validate_batch(data))
+
+        for index, (line, row) in enumerate(chunk):
+            errors = chunk_errors.get(index)
+            if not errors:
+                instance, errors = _build_instance(model, columns, row)
+
+            if errors:
+                report.add_error(line, errors)
+                continue
+
+            batch.append(instance)
+
+        _flush(model, batch, report)
+
+    return report
+
+
+def import_csv(name, lines, batch_size=DEFAULT_BATCH_SIZE):
+    """Importa un CSV con encabezado (archivo o iterable de líneas) fila por fila"""
+    return import_rows(name, csv.DictReader(lines, restval=""), batch_size)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from app.exports import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS, iter_export
+
+
+class Command(BaseCommand):
+    """Exporta todas las filas de un modelo a CSV o NDJSON"""
+
+    help = "Exporta un modelo a CSV o NDJSON leyendo la tabla por bloques"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando"""
+        parser.add_argument("model", choices=sorted(EXPORTS))
+        parser.add_argument("--format", dest="export_format",
+                            choices=sorted(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--output", "-o",
+                            help="Archivo de destino (por defecto la salida estándar)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        """Escribe el export línea por línea en el destino elegido"""
+        lines = iter_export(
+            options["model"], options["export_format"], options["chunk_size"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
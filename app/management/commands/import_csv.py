@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.imports import DEFAULT_BATCH_SIZE, IMPORTS, import_csv
+
+
+class Command(BaseCommand):
+    """Importa filas de un archivo CSV validándolas con las reglas de los formularios"""
+
+    help = "Importa un CSV con encabezado insertando las filas válidas por lotes"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando"""
+        parser.add_argument("model", choices=sorted(IMPORTS))
+        parser.add_argument("path", help="Archivo CSV a importar")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        """Importa el archivo e informa los errores por línea"""
+        with open(options["path"], encoding="utf-8-sig", newline="") as csv_file:
+            try:
+                report = import_csv(options["model"], csv_file, options["batch_size"])
+            except UnicodeDecodeError as error:
+                raise CommandError(f"El archivo debe estar codificado en UTF-8: {error}") from error
+
+        for line, errors in report.errors:
+            messages = "; ".join(f"{field}: {message}" for field, message in errors.items())
+            self.stderr.write(f"Línea {line}: {messages}")
+
+        self.stdout.write(
+            f"Filas leídas: {report.rows}, importadas: {report.created}, "
+            f"con errores: {report.error_count}",
+        )
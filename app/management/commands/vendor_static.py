@@ -0,0 +1,105 @@
+import base64
+import hashlib
+import urllib.request
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent.parent / "static" / "vendor"
+
+CDN = "https://cdn.jsdelivr.net/npm"
+
+BOOTSTRAP = "5.3.8"
+BOOTSTRAP_ICONS = "1.13.1"
+
+# (URL de origen, ruta dentro de app/static/vendor, integridad SRI). Los archivos
+# están versionados en el repositorio; para cambiar de versión se actualizan las
+# versiones y los hashes y se ejecuta `vendor_static --update`
+VENDOR_ASSETS = (
+    (
+        f"{CDN}/bootstrap@{BOOTSTRAP}/dist/css/bootstrap.min.css",
+        "bootstrap/bootstrap.min.css",
+        "sha384-sRIl4kxILFvY47J16cr9ZwB07vP4J8+LH7qKQnuqkuIAvNWLzeN8tE5YBujZqJLB",
+    ),
+    (
+        f"{CDN}/bootstrap@{BOOTSTRAP}/dist/css/bootstrap.min.css.map",
+        "bootstrap/bootstrap.min.css.map",
+        "sha384-IGzRD4jINKs2iSsOq2MORajTvAmIsb5zZ1DXovbJoJdvmiCcdj9KLJocCj0TS60/",
+    ),
+    (
+        f"{CDN}/bootstrap@{BOOTSTRAP}/dist/js/bootstrap.min.js",
+        "bootstrap/bootstrap.min.js",
+        "sha384-G/EV+4j2dNv+tEPo3++6LCgdCROaejBqfUeNjuKAiuXbjrxilcCdDz6ZAVfHWe1Y",
+    ),
+    (
+        f"{CDN}/bootstrap@{BOOTSTRAP}/dist/js/bootstrap.min.js.map",
+        "bootstrap/bootstrap.min.js.map",
+        "sha384-17oecNqgDqPauQp5Ih4V07YkQNhrtAFYqaktlvGJ8i2jpzrvpTPJE7CoEZ7tF7x5",
+    ),
+    (
+        f"{CDN}/bootstrap-icons@{BOOTSTRAP_ICONS}/font/bootstrap-icons.min.css",
+        "bootstrap-icons/bootstrap-icons.min.css",
+        "sha384-CK2SzKma4jA5H/MXDUU7i1TqZlCFaD4T01vtyDFvPlD97JQyS+IsSh1nI2EFbpyk",
+    ),
+    (
+        f"{CDN}/bootstrap-icons@{BOOTSTRAP_ICONS}/font/fonts/bootstrap-icons.woff2",
+        "bootstrap-icons/fonts/bootstrap-icons.woff2",
+        "sha384-xEoI56EFpIZiDZZKBZxsn3gO3u/FvXtOpHbtkMWmSdfzDw3x9XdVc3i70O9hm4SC",
+    ),
+    (
+        f"{CDN}/bootstrap-icons@{BOOTSTRAP_ICONS}/font/fonts/bootstrap-icons.woff",
+        "bootstrap-icons/fonts/bootstrap-icons.woff",
+        "sha384-IYfD9pNP/nesQsPyYtTdGCb4uhEWUmNF8GxaCvqcJFH+Of3c1b0VbH6hdHUonDSC",
+    ),
+)
+
+
+def integrity(content):
+    """Retorna el hash SRI (sha384) del contenido"""
+    digest = hashlib.sha384(content).digest()
+    return "sha384-" + base64.b64encode(digest).decode()
+
+
+def mismatched_assets():
+    """Retorna las rutas de los archivos que faltan o no coinciden con su hash fijado"""
+    return [
+        name for _, name, expected in VENDOR_ASSETS
+        if not (VENDOR_DIR / name).exists()
+        or integrity((VENDOR_DIR / name).read_bytes()) != expected
+    ]
+
+
+class Command(BaseCommand):
+    """Verifica (o actualiza) Bootstrap y bootstrap-icons en los estáticos de la aplicación"""
+
+    help = "Verifica los archivos de app/static/vendor contra las versiones y hashes fijados"
+
+    def add_arguments(self, parser):
+        """Define los argumentos del comando"""
+        parser.add_argument("--update", action="store_true",
+                            help="Descarga del CDN los archivos que no coinciden")
+
+    def handle(self, *args, **options):
+        """Verifica la integridad de cada archivo y, con --update, descarga los distintos"""
+        mismatched = mismatched_assets()
+        if not mismatched:
+            self.stdout.write(f"{len(VENDOR_ASSETS)} archivos verificados")
+            return
+        if not options["update"]:
+            raise CommandError(
+                "No coinciden con su hash fijado: " + ", ".join(mismatched)
+                + " (usar --update para descargarlos)",
+            )
+
+        for url, name, expected in VENDOR_ASSETS:
+            if name not in mismatched:
+                continue
+            with urllib.request.urlopen(url, timeout=30) as response:
+                content = response.read()
+            if integrity(content) != expected:
+                raise CommandError(f"La integridad de {url} no coincide con {expected}")
+
+            path = VENDOR_DIR / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            self.stdout.write(f"Descargado {name}")
@@ -0,0 +1,214 @@
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .routers import replica_reads
+
+try:
+    import brotli
+except ImportError:  # Brotli es opcional: sin él se comprime solo con gzip
+    brotli = None
+
+# Cookie firmada que fija la lectura en la base principal después de escribir
+PRIMARY_PIN_COOKIE = "db_primary"
+PRIMARY_PIN_SALT = "app.middleware.primary-pin"
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def _with_replica_reads(content):
+    # El contenido de un StreamingHttpResponse (exportaciones) se genera
+    # después de que la vista retorna, fuera del alcance de la petición
+    with replica_reads():
+        yield from content
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decide si las lecturas de cada petición pueden ir a una réplica.
+
+    Los GET y HEAD leen de las réplicas, salvo que el navegador haya escrito
+    hace menos de REPLICA_PIN_SECONDS segundos: toda petición que no es GET ni
+    HEAD deja una cookie firmada que fija las lecturas en la base principal
+    durante ese lapso, para que el usuario vea sus propios cambios.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _use_replica(self, request):
+        if not settings.REPLICA_DATABASES or request.method not in SAFE_METHODS:
+            return False
+        pinned = request.get_signed_cookie(
+            PRIMARY_PIN_COOKIE, default=None, salt=PRIMARY_PIN_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS,
+        )
+        return pinned is None
+
+    def _process_response(self, request, response, use_replica):
+        if settings.REPLICA_DATABASES and request.method not in SAFE_METHODS:
+            response.set_signed_cookie(
+                PRIMARY_PIN_COOKIE, "1", salt=PRIMARY_PIN_SALT,
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax",
+            )
+        if use_replica and response.streaming and not response.is_async:
+            response.streaming_content = _with_replica_reads(response.streaming_content)
+        return response
+
+    def __call__(self, request):
+        """Procesa la petición con las lecturas dirigidas a la base elegida"""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        use_replica = self._use_replica(request)
+        with replica_reads(use_replica):
+            response = self.get_response(request)
+        return self._process_response(request, response, use_replica)
+
+    async def __acall__(self, request):
+        """Variante asíncrona de __call__"""
+        use_replica = self._use_replica(request)
+        with replica_reads(use_replica):
+            response = await self.get_response(request)
+        return self._process_response(request, response, use_replica)
+
+
+# Peso (q) de una codificación en Accept-Encoding; q=0 significa "no aceptada"
+_QUALITY = re.compile(r"q=([01](?:\.[0-9]*)?)")
+
+
+def accepted_encodings(header):
+    """Retorna las codificaciones aceptadas por el cliente (q mayor a 0)"""
+    encodings = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        quality = _QUALITY.search(params)
+        if coding.strip() and (quality is None or float(quality[1]) > 0):
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def _brotli_stream(compressor, content):
+    for chunk in content:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _brotli_astream(compressor, content):
+    async for chunk in content:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Comprime las respuestas con brotli o gzip según el Accept-Encoding.
+
+    Brotli se prefiere cuando el cliente lo acepta y el paquete está instalado;
+    en otro caso se delega en GZipMiddleware, que también se encarga de las
+    respuestas cortas, las ya comprimidas y las etiquetas ETag.
+    """
+
+    # Calidad de brotli para respuestas dinámicas: las calidades altas (hasta
+    # 11) comprimen algo más pero tardan demasiado por petición
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        """Comprime la respuesta con la mejor codificación aceptada"""
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is None or "br" not in accepted:
+            return super().process_response(request, response)
+
+        if not response.streaming and len(response.content) < 200:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.streaming:
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            if response.is_async:
+                response.streaming_content = _brotli_astream(
+                    compressor, response.streaming_content,
+                )
+            else:
+                response.streaming_content = _brotli_stream(
+                    compressor, response.streaming_content,
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # Igual que GZipMiddleware: el contenido cambió, la ETag deja de ser fuerte
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
+
+
+# Indentación y líneas en blanco que siguen a un salto de línea, y bloques cuyo
+# contenido se muestra tal cual y no se toca
+_LINE_WHITESPACE = re.compile(r"\n\s+")
+_PRESERVED_BLOCKS = re.compile(
+    r"(<(pre|textarea)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL,
+)
+
+
+def minify_html(html):
+    """Quita la indentación y las líneas en blanco fuera de <pre> y <textarea>"""
+    parts = _PRESERVED_BLOCKS.split(html)
+    # split alterna texto, bloque preservado y nombre de la etiqueta
+    for index in range(0, len(parts), 3):
+        parts[index] = _LINE_WHITESPACE.sub("\n", parts[index])
+    return "".join(
+        part for index, part in enumerate(parts) if index % 3 != 2
+    )
+
+
+class HtmlMinifyMiddleware(MiddlewareMixin):
+    """
+    Quita la indentación de las páginas HTML generadas por las plantillas.
+
+    Solo se eliminan espacios que el navegador ya colapsa (los que siguen a un
+    salto de línea), fuera de <pre> y <textarea>. Se activa con MINIFY_HTML.
+    """
+
+    def __init__(self, get_response):
+        if not settings.MINIFY_HTML:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        """Minifica el contenido de las respuestas HTML completas"""
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith("text/html")
+        ):
+            return response
+
+        content = minify_html(response.content.decode(response.charset))
+        response.content = content.encode(response.charset)
+        if response.has_header("Content-Length"):
+            response.headers["Content-Length"] = str(len(response.content))
+        return response
@@ -0,0 +1,69 @@
+# Generated by Django 5.0.4 on 2026-10-18 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_remove_client_address_client_city'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name'], name='client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['email'], name='client_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['city'], name='client_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['city', 'name'], name='client_city_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(fields=['dose'], name='medicine_dose_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['birthday'], name='pet_birthday_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['breed'], name='pet_breed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['breed', 'birthday'], name='pet_breed_birthday_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['price'], name='product_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['type'], name='product_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['type', 'price'], name='product_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['name'], name='vet_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['speciality'], name='vet_speciality_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['speciality', 'name'], name='vet_speciality_name_idx'),
+        ),
+    ]
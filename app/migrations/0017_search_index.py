@@ -0,0 +1,102 @@
+from django.db import migrations
+
+# SQL congelado del índice de búsqueda tal como se creó en esta migración; los
+# cambios posteriores de app.search se aplican con migraciones propias
+SEARCH_INDEX_TABLES = {
+    "app_medicine_fts": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS app_medicine_fts USING fts5("
+        "name, description, content='app_medicine', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS app_medicine_fts_ai AFTER INSERT ON app_medicine "
+        "BEGIN INSERT INTO app_medicine_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS app_medicine_fts_ad AFTER DELETE ON app_medicine "
+        "BEGIN INSERT INTO app_medicine_fts(app_medicine_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS app_medicine_fts_au AFTER UPDATE ON app_medicine "
+        "BEGIN INSERT INTO app_medicine_fts(app_medicine_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO app_medicine_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END",
+    ),
+    "app_product_fts": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS app_product_fts USING fts5("
+        "name, type, content='app_product', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS app_product_fts_ai AFTER INSERT ON app_product "
+        "BEGIN INSERT INTO app_product_fts(rowid, name, type) "
+        "VALUES (new.id, new.name, new.type); END",
+        "CREATE TRIGGER IF NOT EXISTS app_product_fts_ad AFTER DELETE ON app_product "
+        "BEGIN INSERT INTO app_product_fts(app_product_fts, rowid, name, type) "
+        "VALUES ('delete', old.id, old.name, old.type); END",
+        "CREATE TRIGGER IF NOT EXISTS app_product_fts_au AFTER UPDATE ON app_product "
+        "BEGIN INSERT INTO app_product_fts(app_product_fts, rowid, name, type) "
+        "VALUES ('delete', old.id, old.name, old.type); "
+        "INSERT INTO app_product_fts(rowid, name, type) VALUES (new.id, new.name, new.type); END",
+    ),
+    "app_provider_fts": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS app_provider_fts USING fts5("
+        "name, address, content='app_provider', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS app_provider_fts_ai AFTER INSERT ON app_provider "
+        "BEGIN INSERT INTO app_provider_fts(rowid, name, address) "
+        "VALUES (new.id, new.name, new.address); END",
+        "CREATE TRIGGER IF NOT EXISTS app_provider_fts_ad AFTER DELETE ON app_provider "
+        "BEGIN INSERT INTO app_provider_fts(app_provider_fts, rowid, name, address) "
+        "VALUES ('delete', old.id, old.name, old.address); END",
+        "CREATE TRIGGER IF NOT EXISTS app_provider_fts_au AFTER UPDATE ON app_provider "
+        "BEGIN INSERT INTO app_provider_fts(app_provider_fts, rowid, name, address) "
+        "VALUES ('delete', old.id, old.name, old.address); "
+        "INSERT INTO app_provider_fts(rowid, name, address) "
+        "VALUES (new.id, new.name, new.address); END",
+    ),
+    "app_client_fts": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS app_client_fts USING fts5("
+        "name, content='app_client', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS app_client_fts_ai AFTER INSERT ON app_client "
+        "BEGIN INSERT INTO app_client_fts(rowid, name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER IF NOT EXISTS app_client_fts_ad AFTER DELETE ON app_client "
+        "BEGIN INSERT INTO app_client_fts(app_client_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); END",
+        "CREATE TRIGGER IF NOT EXISTS app_client_fts_au AFTER UPDATE ON app_client "
+        "BEGIN INSERT INTO app_client_fts(app_client_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); "
+        "INSERT INTO app_client_fts(rowid, name) VALUES (new.id, new.name); END",
+    ),
+}
+
+
+def forwards(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for fts, statements in SEARCH_INDEX_TABLES.items():
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def backwards(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for fts in SEARCH_INDEX_TABLES:
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0016_repository_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
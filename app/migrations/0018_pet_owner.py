@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pets', to='app.client'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:12
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0018_pet_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vet',
+            name='closing_time',
+            field=models.TimeField(default=datetime.time(18, 0)),
+        ),
+        migrations.AddField(
+            model_name='vet',
+            name='opening_time',
+            field=models.TimeField(default=datetime.time(9, 0)),
+        ),
+        migrations.CreateModel(
+            name='Appointment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='appointments', to='app.pet')),
+                ('vet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='appointments', to='app.vet')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['vet', 'start'], name='appointment_vet_start_idx'), models.Index(fields=['start'], name='appointment_start_idx'), models.Index(fields=['end'], name='appointment_end_idx'), models.Index(fields=['updated_at'], name='appointment_updated_at_idx')],
+            },
+        ),
+    ]
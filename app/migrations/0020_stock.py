@@ -0,0 +1,38 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_appointment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicine',
+            name='stock',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='stock',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('medicine', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='app.medicine')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='app.product')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='stockmovement',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('medicine__isnull', True), ('product__isnull', False)), models.Q(('medicine__isnull', False), ('product__isnull', True)), _connector='OR'), name='stock_movement_single_item'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0021_invoice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.CharField(max_length=30)),
+                ('key', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(fields=['stock'], name='medicine_stock_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardcounter',
+            constraint=models.UniqueConstraint(fields=('group', 'key'), name='dashboard_counter_unique'),
+        ),
+    ]
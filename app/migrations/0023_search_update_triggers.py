@@ -0,0 +1,92 @@
+from django.db import migrations
+
+# SQL congelado: los triggers de actualización se disparan solo cuando cambian
+# las columnas indexadas (antes lo hacían con cualquier UPDATE, como los de stock)
+UPDATE_OF_TRIGGERS = {
+    "app_medicine_fts": (
+        "CREATE TRIGGER app_medicine_fts_au AFTER UPDATE OF name, description ON app_medicine "
+        "BEGIN INSERT INTO app_medicine_fts(app_medicine_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO app_medicine_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    "app_product_fts": (
+        "CREATE TRIGGER app_product_fts_au AFTER UPDATE OF name, type ON app_product "
+        "BEGIN INSERT INTO app_product_fts(app_product_fts, rowid, name, type) "
+        "VALUES ('delete', old.id, old.name, old.type); "
+        "INSERT INTO app_product_fts(rowid, name, type) VALUES (new.id, new.name, new.type); END"
+    ),
+    "app_provider_fts": (
+        "CREATE TRIGGER app_provider_fts_au AFTER UPDATE OF name, address ON app_provider "
+        "BEGIN INSERT INTO app_provider_fts(app_provider_fts, rowid, name, address) "
+        "VALUES ('delete', old.id, old.name, old.address); "
+        "INSERT INTO app_provider_fts(rowid, name, address) "
+        "VALUES (new.id, new.name, new.address); END"
+    ),
+    "app_client_fts": (
+        "CREATE TRIGGER app_client_fts_au AFTER UPDATE OF name ON app_client "
+        "BEGIN INSERT INTO app_client_fts(app_client_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); "
+        "INSERT INTO app_client_fts(rowid, name) VALUES (new.id, new.name); END"
+    ),
+}
+
+UPDATE_TRIGGERS = {
+    "app_medicine_fts": (
+        "CREATE TRIGGER app_medicine_fts_au AFTER UPDATE ON app_medicine "
+        "BEGIN INSERT INTO app_medicine_fts(app_medicine_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO app_medicine_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    "app_product_fts": (
+        "CREATE TRIGGER app_product_fts_au AFTER UPDATE ON app_product "
+        "BEGIN INSERT INTO app_product_fts(app_product_fts, rowid, name, type) "
+        "VALUES ('delete', old.id, old.name, old.type); "
+        "INSERT INTO app_product_fts(rowid, name, type) VALUES (new.id, new.name, new.type); END"
+    ),
+    "app_provider_fts": (
+        "CREATE TRIGGER app_provider_fts_au AFTER UPDATE ON app_provider "
+        "BEGIN INSERT INTO app_provider_fts(app_provider_fts, rowid, name, address) "
+        "VALUES ('delete', old.id, old.name, old.address); "
+        "INSERT INTO app_provider_fts(rowid, name, address) "
+        "VALUES (new.id, new.name, new.address); END"
+    ),
+    "app_client_fts": (
+        "CREATE TRIGGER app_client_fts_au AFTER UPDATE ON app_client "
+        "BEGIN INSERT INTO app_client_fts(app_client_fts, rowid, name) "
+        "VALUES ('delete', old.id, old.name); "
+        "INSERT INTO app_client_fts(rowid, name) VALUES (new.id, new.name); END"
+    ),
+}
+
+
+def replace_triggers(triggers):
+    def operation(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != "sqlite":
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            for fts, statement in triggers.items():
+                if fts not in tables:
+                    continue
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_au")
+                cursor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0022_dashboard'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            replace_triggers(UPDATE_OF_TRIGGERS), replace_triggers(UPDATE_TRIGGERS),
+        ),
+    ]
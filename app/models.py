@@ -1,73 +1,153 @@
-import re
+import datetime
+import math
+import operator
+from decimal import Decimal
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+
+from .cache import invalidate
+from .validation import (
+    Field,
+    Schema,
+    at_most,
+    between,
+    check,
+    contains,
+    convert,
+    digits,
+    ends_with,
+    greater_than,
+    matches,
+    none_of,
+    not_blank,
+    one_of,
+    parse_digits,
+    required,
+    starts_with,
+)
+
+
+class ChangeTrackingMixin(models.Model):
+    """
+    Recuerda los valores leídos de la base para que save() actualice solo las
+    columnas modificadas y omita el UPDATE cuando no hubo cambios.
+    """
+
+    class Meta:
+        abstract = True
 
-from django.db import models
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Crea la instancia desde la base y guarda una copia de sus valores"""
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_values()
+        return instance
+
+    def _snapshot_values(self):
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def _has_changed(self, field, loaded):
+        current = self.__dict__.get(field.attname)
+        if current == loaded:
+            return False
+        try:
+            # Los formularios asignan texto ("54221") a campos numéricos o de fecha
+            return field.to_python(current) != loaded
+        except ValidationError:
+            return True
+
+    def get_changed_fields(self):
+        """Retorna los nombres de los campos cuyo valor cambió desde que se leyó"""
+        loaded_values = getattr(self, "_loaded_values", {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname in loaded_values
+            and self._has_changed(field, loaded_values[field.attname])
+        ]
+
+    def save(self, *args, **kwargs):
+        """Guarda solo los campos modificados de una instancia leída de la base"""
+        tracked = (
+            not args
+            and not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and hasattr(self, "_loaded_values")
+        )
+        if tracked:
+            changed = self.get_changed_fields()
+            if not changed:
+                return
+            kwargs["update_fields"] = changed
+
+        super().save(*args, **kwargs)
+        self._snapshot_values()
+
+    def refresh_from_db(self, *args, **kwargs):
+        """Recarga los valores desde la base y actualiza la copia de referencia"""
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_values()
+
+
+CLIENT_SCHEMA = Schema(
+    Field(
+        "name",
+        not_blank("El nombre no puede estar vacío o contener solo espacios"),
+        matches("^[a-zA-Z ]+$", "El nombre solo puede contener letras y espacios"),
+    ),
+    Field(
+        "phone",
+        required("Por favor ingrese un teléfono"),
+        starts_with("54", "El teléfono debe comenzar con 54"),
+        digits("Por favor ingrese un teléfono valido"),
+        convert(int, "Por favor ingrese un teléfono valido"),
+        greater_than(0, "El número debe ser positivo"),
+    ),
+    Field(
+        "email",
+        required("Por favor ingrese un email"),
+        contains("@", "El email debe contener @"),
+        ends_with("@vetsoft.com", "Por favor el email debe ser del dominio @vetsoft.com"),
+        none_of(("@vetsoft.com",),
+                "Por favor el email debe tener una parte local antes de @vetsoft.com"),
+    ),
+    Field(
+        "city",
+        required("Por favor ingrese una ciudad"),
+        one_of(("La Plata", "Berisso", "Ensenada"), "Por favor ingrese una ciudad válida"),
+    ),
+)
 
 
 def validate_client(data):
     """ Valida los datos del cliente """
-    errors = {}
-
-    name = data.get("name", "")
-    phone = data.get("phone", "")
-    email = data.get("email", "")
-    city = data.get("city", "")
-
-    if not name.strip():
-        errors["name"] = "El nombre no puede estar vacío o contener solo espacios"
-    elif not re.match("^[a-zA-Z ]+$", name):
-        errors["name"] = "El nombre solo puede contener letras y espacios"
-
-    if phone == "":
-        errors["phone"] = "Por favor ingrese un teléfono"
-    elif len(re.findall("^54", phone)) == 0:
-        errors["phone"] = "El teléfono debe comenzar con 54"
-    elif not phone.isdigit():
-        errors["phone"] = "Por favor ingrese un teléfono valido"
-    elif int(phone) <= 0:
-        errors["phone"] = "El número debe ser positivo"
-
-    if email == "":
-        errors["email"] = "Por favor ingrese un email"
-    elif "@" not in email:
-        errors["email"] = "El email debe contener @"
-    else:
-        try:
-            local_part, domain_part = email.rsplit("@", 1)
-            if domain_part != "vetsoft.com":
-                errors["email"] = "Por favor el email debe ser del dominio @vetsoft.com"
-            elif local_part == "":
-                errors["email"] = "Por favor el email debe tener una parte local antes de @vetsoft.com"
-        except ValueError:
-            errors["email"] = "Por favor ingrese un email válido"
-
-    if city == "":
-        errors["city"] = "Por favor ingrese una ciudad"
-    elif not (city == "La Plata" or city == "Berisso" or city == "Ensenada"):
-        errors["city"] = "Por favor ingrese una ciudad válida"
+    return CLIENT_SCHEMA.validate(data)
 
-    return errors
+
+PROVIDER_SCHEMA = Schema(
+    Field("name", required("Por favor ingrese un nombre")),
+    Field(
+        "email",
+        required("Por favor ingrese un email"),
+        contains("@", "Por favor ingrese un email válido"),
+    ),
+    Field("address", required("Por favor ingrese una dirección")),
+)
 
 
 def validate_provider(data):
     """ Valida los datos del proveedor """
-    errors = {}
-
-    name = data.get("name", "")
-    email = data.get("email", "")
-    address = data.get("address", "")
-
-    if name == "":
-        errors["name"] = "Por favor ingrese un nombre"
-
-    if email == "":
-        errors["email"] = "Por favor ingrese un email"
-    elif email.count("@") == 0:
-        errors["email"] = "Por favor ingrese un email válido"
-
-    if address == "":
-        errors["address"] = "Por favor ingrese una dirección"
-
-    return errors
+    return PROVIDER_SCHEMA.validate(data)
 
 
 class City(models.TextChoices):
@@ -77,7 +157,7 @@ class City(models.TextChoices):
     ENSENADA = "Ensenada",
 
 
-class Client(models.Model):
+class Client(ChangeTrackingMixin, models.Model):
     """Representa un cliente de la veterinaria"""
     name = models.CharField(max_length=100)
     phone = models.IntegerField()
@@ -88,6 +168,14 @@ class Client(models.Model):
         default=City.LA_PLATA,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="client_name_idx"),
+            models.Index(fields=["email"], name="client_email_idx"),
+            models.Index(fields=["city"], name="client_city_idx"),
+            models.Index(fields=["city", "name"], name="client_city_name_idx"),
+        ]
+
     def __str__(self):
         """Retorna la representación en cadena del cliente"""
         return self.name
@@ -133,30 +221,31 @@ class Breed(models.TextChoices):
     BIRD = "Bird"
 
 
-def validate_pet(data):
-    """Valida los datos de la mascosta"""
-    errors = {}
+def _invalid_owner(value):
+    """El dueño es opcional, pero si se envía debe ser un id"""
+    return value != "" and parse_digits(value) is None
 
-    name = data.get("name", "")
-    breed = data.get("breed", "")
-    birthday = data.get("birthday", "")
 
-    if name == "":
-        errors["name"] = "Por favor ingrese un nombre de la mascota"
+PET_SCHEMA = Schema(
+    Field("name", required("Por favor ingrese un nombre de la mascota")),
+    Field("breed", one_of(Breed.values, "No esta esa opcion")),
+    Field("birthday", required("Por favor ingrese la fecha de nacimiento de la mascota")),
+    Field("owner", check(_invalid_owner, "Por favor seleccione un dueño válido")),
+)
 
-    if breed == "":
-        errors["breed"] = "Por favor ingrese la raza de la mascota"
 
-    if (breed, breed) not in Breed.choices:
-        errors["breed"] = "No esta esa opcion"
+def validate_pet(data):
+    """Valida los datos de la mascosta"""
+    errors = PET_SCHEMA.validate(data)
 
-    if birthday == "":
-        errors["birthday"] = "Por favor ingrese la fecha de nacimiento de la mascota"
+    owner = data.get("owner", "")
+    if "owner" not in errors and owner and not Client.objects.filter(pk=owner).exists():
+        errors["owner"] = "El dueño seleccionado no existe"
 
     return errors
 
 
-class Pet(models.Model):
+class Pet(ChangeTrackingMixin, models.Model):
     """Representa una mascota en la veterinaria"""
     name = models.CharField(max_length=100)
     breed = models.CharField(
@@ -165,6 +254,21 @@ class Pet(models.Model):
         default=Breed.DOG,
     )
     birthday = models.DateField()
+    # Indexada (db_index por defecto) para listar las mascotas de un cliente
+    owner = models.ForeignKey(
+        Client,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pets",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["birthday"], name="pet_birthday_idx"),
+            models.Index(fields=["breed"], name="pet_breed_idx"),
+            models.Index(fields=["breed", "birthday"], name="pet_breed_birthday_idx"),
+        ]
 
     def __str__(self):
         """Retorna la representación en cadena de la mascota"""
@@ -182,7 +286,7 @@ class Pet(models.Model):
             name=pet_data.get("name"),
             breed=pet_data.get("breed"),
             birthday=pet_data.get("birthday"),
-
+            owner_id=pet_data.get("owner") or None,
         )
         return True, None
 
@@ -196,11 +300,13 @@ class Pet(models.Model):
         self.name = pet_data.get("name", None) or self.name
         self.breed = pet_data.get("breed", None) or self.breed
         self.birthday = pet_data.get("birthday", None) or self.birthday
+        if "owner" in pet_data:
+            self.owner_id = pet_data.get("owner") or None
 
         self.save()
 
 
-class Provider(models.Model):
+class Provider(ChangeTrackingMixin, models.Model):
     """Representa un proveedor de productos para la veterinaria"""
     name = models.CharField(max_length=100)
     email = models.EmailField()
@@ -238,45 +344,144 @@ class Provider(models.Model):
         self.save()
 
 
-def isfloat(num):
-    """Verifica si el valor dado es un número flotante"""
-    try:
-        float(num)
+class StockKind(models.TextChoices):
+    """Define los tipos de movimiento de stock"""
+    IN = "in", "Ingreso"
+    OUT = "out", "Egreso"
+
+
+# Tope de un movimiento: evita que un ingreso desborde la columna de stock
+MAX_STOCK_MOVEMENT = 1_000_000
+
+STOCK_MOVEMENT_SCHEMA = Schema(
+    Field(
+        "kind",
+        required("Por favor seleccione el tipo de movimiento"),
+        one_of(StockKind.values, "Por favor seleccione un tipo de movimiento válido"),
+    ),
+    Field(
+        "quantity",
+        required("Por favor ingrese una cantidad"),
+        digits("La cantidad debe ser un número entero positivo"),
+        convert(int, "La cantidad debe ser un número entero positivo"),
+        greater_than(0, "La cantidad debe ser un número entero positivo"),
+        at_most(MAX_STOCK_MOVEMENT, f"La cantidad no puede superar {MAX_STOCK_MOVEMENT}"),
+    ),
+)
+
+
+class StockMixin(models.Model):
+    """
+    Stock disponible de un artículo, que solo cambia con move_stock.
+
+    Cada movimiento es un UPDATE con F("stock") + cantidad que la base aplica
+    sobre el valor vigente (y, si resta, solo cuando alcanza), así las ventas
+    simultáneas no pisan sus cambios ni dejan stock negativo. Las ediciones del
+    formulario no lo sobrescriben porque ChangeTrackingMixin guarda solo las
+    columnas modificadas.
+    """
+    stock = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def move_stock(cls, pk, quantity):
+        """Suma quantity al stock (resta si es negativa) y registra el movimiento; indica si se pudo"""
+        items = cls.objects.filter(pk=pk)
+        if quantity < 0:
+            items = items.filter(stock__gte=-quantity)
+
+        with transaction.atomic():
+            if not items.update(stock=F("stock") + quantity):
+                return False
+            StockMovement.objects.create(**{f"{cls._meta.model_name}_id": pk}, quantity=quantity)
+            # update() no envía post_save: se invalida el listado a mano
+            transaction.on_commit(lambda: invalidate(cls))
+
         return True
-    except ValueError:
-        return False
 
+    @classmethod
+    def take_stock(cls, quantities):
+        """
+        Resta varias cantidades ({pk: cantidad}) con un único UPDATE y registra
+        los movimientos; si alguna no alcanza no resta ninguna e indica False.
+        """
+        enough = reduce(
+            operator.or_, (Q(pk=pk, stock__gte=quantity) for pk, quantity in quantities.items()),
+        )
+        remaining = Case(
+            *(When(pk=pk, then=F("stock") - quantity) for pk, quantity in quantities.items()),
+            default=F("stock"),
+            output_field=models.PositiveIntegerField(),
+        )
 
-def validate_product(data):
-    """Valida los datos del producto"""
-    errors = {}
+        with transaction.atomic():
+            if cls.objects.filter(enough).update(stock=remaining) != len(quantities):
+                transaction.set_rollback(True)
+                return False
+            StockMovement.objects.bulk_create(
+                StockMovement(**{f"{cls._meta.model_name}_id": pk}, quantity=-quantity)
+                for pk, quantity in quantities.items()
+            )
+            transaction.on_commit(lambda: invalidate(cls))
 
-    name = data.get("name", "")
-    type = data.get("type", "")
-    price = data.get("price", "")
+        return True
 
-    if name == "":
-        errors["name"] = "Por favor ingrese un nombre"
+    @classmethod
+    def save_stock_movement(cls, pk, movement_data):
+        """"Registra un ingreso o egreso de stock del artículo"""
+        errors = STOCK_MOVEMENT_SCHEMA.validate(movement_data)
 
-    if type == "":
-        errors["type"] = "Por favor ingrese un tipo del producto"
+        if len(errors.keys()) > 0:
+            return False, errors
 
-    if price == "":
-        errors["price"] = "Por favor ingrese un precio"
-    elif not isfloat(price):
-        errors["price"] = "Por favor ingrese un precio"
-    elif float(price) <= 0:
-        errors["price"] = "El precio debe ser mayor a cero"
+        quantity = int(movement_data.get("quantity"))
+        if movement_data.get("kind") == StockKind.OUT:
+            quantity = -quantity
 
-    return errors
+        if not cls.move_stock(pk, quantity):
+            return False, {"quantity": "No hay stock suficiente"}
+
+        return True, None
 
 
-class Product(models.Model):
+# Tope del precio de un producto, para que las ventas entren en sus columnas de importe
+MAX_PRICE = 1_000_000
+
+PRODUCT_SCHEMA = Schema(
+    Field("name", required("Por favor ingrese un nombre")),
+    Field("type", required("Por favor ingrese un tipo del producto")),
+    Field(
+        "price",
+        required("Por favor ingrese un precio"),
+        convert(float, "Por favor ingrese un precio"),
+        # float() acepta "inf" y "nan"
+        check(lambda v: not math.isfinite(v), "Por favor ingrese un precio"),
+        greater_than(0, "El precio debe ser mayor a cero"),
+        at_most(MAX_PRICE, f"El precio no puede superar {MAX_PRICE}"),
+    ),
+)
+
+
+def validate_product(data):
+    """Valida los datos del producto"""
+    return PRODUCT_SCHEMA.validate(data)
+
+
+class Product(ChangeTrackingMixin, StockMixin, models.Model):
     """Representa un producto en la veterinaria"""
     name = models.CharField(max_length=100)
     type = models.CharField(max_length=100)
     price = models.FloatField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["price"], name="product_price_idx"),
+            models.Index(fields=["type"], name="product_type_idx"),
+            models.Index(fields=["type", "price"], name="product_type_price_idx"),
+        ]
+
     def __str__(self):
         """Retorna la representación en cadena del producto"""
         return self.name
@@ -312,43 +517,63 @@ class Product(models.Model):
         return True, None
 
 
-def validate_vet(data):
-    """Valida los datos del veterinario"""
-    errors = {}
+def parse_time(value):
+    """Convierte "HH:MM" en un horario; el texto vacío significa sin horario"""
+    return datetime.time.fromisoformat(value) if value else None
 
-    name = data.get("name", "")
-    phone = data.get("phone", "")
-    email = data.get("email", "")
-    speciality = data.get("especialidad", "")
 
-    if name == "":
-        errors["name"] = "Por favor ingrese un nombre"
+VET_SCHEMA = Schema(
+    Field("name", required("Por favor ingrese un nombre")),
+    Field(
+        "phone",
+        required("Por favor ingrese un teléfono"),
+        digits("Por favor ingrese un teléfono"),
+    ),
+    Field(
+        "email",
+        required("Por favor ingrese un email"),
+        contains("@", "Por favor ingrese un email válido"),
+    ),
+    Field("especialidad", required("Por favor seleccione una especialidad")),
+    Field("opening_time", convert(parse_time, "Por favor ingrese un horario válido")),
+    Field("closing_time", convert(parse_time, "Por favor ingrese un horario válido")),
+)
 
-    if phone == "":
-        errors["phone"] = "Por favor ingrese un teléfono"
-    elif not phone.isdigit():
-        errors["phone"] = "Por favor ingrese un teléfono"
+# Horario de atención de un veterinario cuando no se indica otro
+DEFAULT_OPENING_TIME = datetime.time(9)
+DEFAULT_CLOSING_TIME = datetime.time(18)
 
-    if email == "":
-        errors["email"] = "Por favor ingrese un email"
-    elif "@" not in email:  # Agreo una verificacion para saber si hay al menos un "@" en el email
-        errors["email"] = "Por favor ingrese un email válido"
 
-    if speciality == "":
-        errors["especialidad"] = "Por favor seleccione una especialidad"
-    # elif speciality not in [choice[0] for choice in Speciality.choices]:
-    #     errors["speciality"] = "Especialidad no válida"
+def validate_vet(data):
+    """Valida los datos del veterinario"""
+    errors = VET_SCHEMA.validate(data)
+    if errors.keys() & {"opening_time", "closing_time"}:
+        return errors
+
+    opening = parse_time(data.get("opening_time", "")) or DEFAULT_OPENING_TIME
+    closing = parse_time(data.get("closing_time", "")) or DEFAULT_CLOSING_TIME
+    if closing <= opening:
+        errors["closing_time"] = "El horario de cierre debe ser posterior al de apertura"
 
     return errors
 
 
-class Vet(models.Model):
+class Vet(ChangeTrackingMixin, models.Model):
     """Representa un veterinario en la veterinaria"""
     name = models.CharField(max_length=100)
     phone = models.CharField(max_length=15)
     email = models.EmailField()
     address = models.CharField(max_length=100, blank=True)
     speciality = models.CharField(max_length=15)
+    opening_time = models.TimeField(default=DEFAULT_OPENING_TIME)
+    closing_time = models.TimeField(default=DEFAULT_CLOSING_TIME)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="vet_name_idx"),
+            models.Index(fields=["speciality"], name="vet_speciality_idx"),
+            models.Index(fields=["speciality", "name"], name="vet_speciality_name_idx"),
+        ]
 
     def __str__(self):
         """Retorna la representación en cadena del veterinario"""
@@ -368,7 +593,8 @@ class Vet(models.Model):
             email=vet_data.get("email"),
             address=vet_data.get("address"),
             speciality=vet_data.get("especialidad"),
-
+            opening_time=parse_time(vet_data.get("opening_time", "")) or DEFAULT_OPENING_TIME,
+            closing_time=parse_time(vet_data.get("closing_time", "")) or DEFAULT_CLOSING_TIME,
         )
 
         return True, None
@@ -385,6 +611,8 @@ class Vet(models.Model):
         self.phone = vet_data.get("phone", "") or self.phone
         self.address = vet_data.get("address", "") or self.address
         self.speciality = vet_data.get("especialidad", "") or self.speciality
+        self.opening_time = parse_time(vet_data.get("opening_time", "")) or self.opening_time
+        self.closing_time = parse_time(vet_data.get("closing_time", "")) or self.closing_time
 
         self.save()
 
@@ -393,43 +621,38 @@ class Vet(models.Model):
 # Función de validación de medicamentos
 
 
+MEDICINE_SCHEMA = Schema(
+    Field("name", required("Por favor ingrese un nombre")),
+    Field("description", required("Por favor ingrese una descripción")),
+    Field(
+        "dose",
+        required("Por favor ingrese una dosis"),
+        digits("La dosis debe ser un número entero positivo"),
+        convert(int, "La dosis debe ser un número entero positivo"),
+        between(1, 10, "La dosis debe estar entre 1 a 10"),
+    ),
+)
+
+
 def validate_medicine(data):
     """Valida los datos del medicamento"""
-    errors = {}
-
-    name = data.get("name", "")
-    description = data.get("description", "")
-    dose = data.get("dose", "")
-
-    # Validación del nombre
-    if name == "":
-        errors["name"] = "Por favor ingrese un nombre"
-
-    # Validación de la descripción
-    if description == "":
-        errors["description"] = "Por favor ingrese una descripción"
-
-    # Validación de la dosis
-    if dose == "":
-        errors["dose"] = "Por favor ingrese una dosis"
-    elif not dose.isdigit():
-        errors["dose"] = "La dosis debe ser un número entero positivo"
-    else:
-        dose_value = int(dose)
-        if dose_value < 1 or dose_value > 10:
-            errors["dose"] = "La dosis debe estar entre 1 a 10"
-
-    return errors
+    return MEDICINE_SCHEMA.validate(data)
 
 # Definition of the Medicine model
 
 
-class Medicine(models.Model):
+class Medicine(ChangeTrackingMixin, StockMixin, models.Model):
     """Representa una medicina en la veterinaria"""
     name = models.CharField(max_length=100)
     description = models.TextField()
     dose = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["dose"], name="medicine_dose_idx"),
+            models.Index(fields=["stock"], name="medicine_stock_idx"),
+        ]
+
     def __str__(self):
         """Retorna la representación en cadena del medicamento"""
         return self.name
@@ -466,3 +689,343 @@ class Medicine(models.Model):
         self.save()
 
         return True, None
+
+
+class StockMovement(models.Model):
+    """Registra un ingreso (cantidad positiva) o egreso de stock de un producto o medicamento"""
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, null=True, blank=True, related_name="movements",
+    )
+    medicine = models.ForeignKey(
+        Medicine, on_delete=models.CASCADE, null=True, blank=True, related_name="movements",
+    )
+    quantity = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=Q(product__isnull=False, medicine__isnull=True)
+                | Q(product__isnull=True, medicine__isnull=False),
+                name="stock_movement_single_item",
+            ),
+        ]
+
+    def __str__(self):
+        """Retorna la representación en cadena del movimiento"""
+        return f"{self.quantity:+} {self.product or self.medicine}"
+
+    @property
+    def kind(self):
+        """Retorna el tipo de movimiento según el signo de la cantidad"""
+        return StockKind.IN if self.quantity > 0 else StockKind.OUT
+
+
+# Duración de un turno
+APPOINTMENT_MINUTES = 30
+
+
+def _invalid_id(value):
+    return parse_digits(value) is None
+
+
+APPOINTMENT_SCHEMA = Schema(
+    Field(
+        "vet",
+        required("Por favor seleccione un veterinario"),
+        check(_invalid_id, "Por favor seleccione un veterinario"),
+    ),
+    Field(
+        "pet",
+        required("Por favor seleccione una mascota"),
+        check(_invalid_id, "Por favor seleccione una mascota"),
+    ),
+    Field(
+        "start",
+        required("Por favor ingrese la fecha y hora del turno"),
+        convert(datetime.datetime.fromisoformat, "Por favor ingrese una fecha y hora válida"),
+    ),
+)
+
+
+class Appointment(models.Model):
+    """Representa un turno de una mascota con un veterinario"""
+    vet = models.ForeignKey(Vet, on_delete=models.CASCADE, related_name="appointments")
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name="appointments")
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    # Permite a app.scheduling leer solo los turnos modificados desde su última lectura
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["vet", "start"], name="appointment_vet_start_idx"),
+            models.Index(fields=["start"], name="appointment_start_idx"),
+            models.Index(fields=["end"], name="appointment_end_idx"),
+            models.Index(fields=["updated_at"], name="appointment_updated_at_idx"),
+        ]
+
+    def __str__(self):
+        """Retorna la representación en cadena del turno"""
+        return f"{self.pet} con {self.vet} ({self.start:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def save_appointment(cls, appointment_data):
+        """"Reserva un turno si el veterinario atiende y está libre en ese horario"""
+        errors = APPOINTMENT_SCHEMA.validate(appointment_data)
+
+        if len(errors.keys()) > 0:
+            return False, errors
+
+        start = datetime.datetime.fromisoformat(appointment_data.get("start"))
+        if timezone.is_naive(start):
+            start = timezone.make_aware(start)
+        try:
+            end = start + datetime.timedelta(minutes=APPOINTMENT_MINUTES)
+            local_start = timezone.localtime(start)
+            local_end = timezone.localtime(end)
+        except OverflowError:
+            # Fechas en los extremos del calendario (año 1 o 9999)
+            errors["start"] = "Por favor ingrese una fecha y hora válida"
+            return False, errors
+
+        with transaction.atomic():
+            # Bloquea al veterinario (en bases que lo soportan) para que dos
+            # reservas simultáneas no ocupen el mismo horario
+            vet = Vet.objects.select_for_update().filter(pk=appointment_data.get("vet")).first()
+            pet = Pet.objects.filter(pk=appointment_data.get("pet")).first()
+
+            if vet is None:
+                errors["vet"] = "El veterinario seleccionado no existe"
+            if pet is None:
+                errors["pet"] = "La mascota seleccionada no existe"
+            if vet is None or pet is None:
+                return False, errors
+
+            if start < timezone.now():
+                errors["start"] = "El turno no puede ser en el pasado"
+            elif (
+                local_start.date() != local_end.date()
+                or local_start.time() < vet.opening_time
+                or local_end.time() > vet.closing_time
+            ):
+                errors["start"] = "El veterinario no atiende en ese horario"
+            elif Appointment.objects.filter(vet=vet, start__lt=end, end__gt=start).exists():
+                errors["start"] = "El veterinario ya tiene un turno en ese horario"
+
+            if len(errors.keys()) > 0:
+                return False, errors
+
+            Appointment.objects.create(vet=vet, pet=pet, start=start, end=end)
+
+        return True, None
+
+
+# Importes de las ventas: dos decimales
+CENTS = Decimal("0.01")
+
+# Mayor importe que entra en las columnas de las ventas (12 dígitos, 2 decimales)
+MAX_INVOICE_AMOUNT = Decimal("9999999999.99")
+
+
+def parse_invoice_lines(invoice_data):
+    """
+    Lee las líneas del formulario de venta (listas paralelas "product" y
+    "quantity") y las agrupa por producto; retorna ({producto: cantidad}, error).
+    """
+    lines = {}
+    for product, quantity in zip(
+        invoice_data.getlist("product"), invoice_data.getlist("quantity"),
+    ):
+        if product == "" and quantity == "":
+            continue
+        product_id = parse_digits(product)
+        if product_id is None:
+            return lines, "Por favor seleccione un producto en cada línea"
+        amount = parse_digits(quantity)
+        if not amount:
+            return lines, "La cantidad debe ser un número entero positivo"
+        lines[product_id] = lines.get(product_id, 0) + amount
+        if lines[product_id] > MAX_STOCK_MOVEMENT:
+            return lines, f"La cantidad no puede superar {MAX_STOCK_MOVEMENT}"
+
+    if not lines:
+        return lines, "Por favor agregue al menos un producto"
+    return lines, None
+
+
+def line_amounts(price, quantity):
+    """
+    Retorna (precio unitario, subtotal) de una línea de venta, o None si no
+    entran en las columnas de importe (productos guardados antes de MAX_PRICE).
+    """
+    # Se compara antes de redondear: un precio enorme o infinito no se puede llevar a centavos
+    if not price <= MAX_INVOICE_AMOUNT:
+        return None
+    unit_price = Decimal(str(price)).quantize(CENTS)
+    subtotal = unit_price * quantity
+    if subtotal > MAX_INVOICE_AMOUNT:
+        return None
+    return unit_price, subtotal
+
+
+class Invoice(models.Model):
+    """
+    Representa una venta de mostrador.
+
+    La cantidad de unidades y el total se guardan al crear la venta para que
+    los listados y reportes no tengan que sumar las líneas.
+    """
+    client = models.ForeignKey(
+        Client, on_delete=models.SET_NULL, null=True, blank=True, related_name="invoices",
+    )
+    date = models.DateField(default=timezone.localdate)
+    created_at = models.DateTimeField(auto_now_add=True)
+    item_count = models.PositiveIntegerField()
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date"], name="invoice_date_idx"),
+        ]
+
+    def __str__(self):
+        """Retorna la representación en cadena de la venta"""
+        return f"Venta {self.pk} ({self.date})"
+
+    @classmethod
+    def save_invoice(cls, invoice_data):
+        """"Registra una venta con sus líneas y descuenta el stock vendido"""
+        errors = {}
+        client_id = invoice_data.get("client", "")
+        if client_id and parse_digits(client_id) is None:
+            errors["client"] = "Por favor seleccione un cliente válido"
+
+        quantities, lines_error = parse_invoice_lines(invoice_data)
+        if lines_error:
+            errors["lines"] = lines_error
+
+        if len(errors.keys()) > 0:
+            return False, errors
+
+        with transaction.atomic():
+            if client_id and not Client.objects.filter(pk=client_id).exists():
+                errors["client"] = "El cliente seleccionado no existe"
+                return False, errors
+
+            products = Product.objects.in_bulk(quantities)
+            if len(products) != len(quantities):
+                errors["lines"] = "El producto seleccionado no existe"
+                return False, errors
+
+            lines = []
+            for pk, quantity in quantities.items():
+                product = products[pk]
+                amounts = line_amounts(product.price, quantity)
+                if amounts is None:
+                    errors["lines"] = f"El importe de {product.name} supera el máximo de una venta"
+                    return False, errors
+                unit_price, subtotal = amounts
+                lines.append(InvoiceLine(
+                    product_id=pk,
+                    description=product.name,
+                    quantity=quantity,
+                    unit_price=unit_price,
+                    subtotal=subtotal,
+                ))
+
+            total = sum(line.subtotal for line in lines)
+            if total > MAX_INVOICE_AMOUNT:
+                errors["lines"] = "El total supera el máximo de una venta"
+                return False, errors
+
+            if not Product.take_stock(quantities):
+                missing = [
+                    products[pk].name for pk, quantity in quantities.items()
+                    if products[pk].stock < quantity
+                ]
+                errors["lines"] = f"No hay stock suficiente de {', '.join(missing) or 'los productos'}"
+                return False, errors
+
+            invoice = Invoice.objects.create(
+                client_id=client_id or None,
+                item_count=sum(line.quantity for line in lines),
+                total=total,
+            )
+            for line in lines:
+                line.invoice = invoice
+            InvoiceLine.objects.bulk_create(lines)
+            DailySales.add_invoice(invoice)
+
+        return True, None
+
+
+class InvoiceLine(models.Model):
+    """Representa un producto vendido en una venta, con el precio de ese momento"""
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name="lines")
+    product = models.ForeignKey(
+        Product, on_delete=models.SET_NULL, null=True, blank=True, related_name="invoice_lines",
+    )
+    # Nombre del producto al vender, para que la venta se lea igual si cambia o se elimina
+    description = models.CharField(max_length=100)
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2)
+    subtotal = models.DecimalField(max_digits=12, decimal_places=2)
+
+    def __str__(self):
+        """Retorna la representación en cadena de la línea"""
+        return f"{self.quantity} x {self.description}"
+
+
+class DailySales(models.Model):
+    """Totales de ventas por día, que se suman al registrar cada venta"""
+    date = models.DateField(unique=True)
+    invoice_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        """Retorna la representación en cadena de los totales del día"""
+        return f"Ventas del {self.date}: {self.total}"
+
+    @classmethod
+    def add_invoice(cls, invoice):
+        """Suma una venta a los totales de su día con un UPDATE atómico (o crea el día)"""
+        totals = {
+            "invoice_count": F("invoice_count") + 1,
+            "item_count": F("item_count") + invoice.item_count,
+            "total": F("total") + invoice.total,
+        }
+        if cls.objects.filter(date=invoice.date).update(**totals):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    date=invoice.date,
+                    invoice_count=1,
+                    item_count=invoice.item_count,
+                    total=invoice.total,
+                )
+        except IntegrityError:
+            # Otra venta creó el día al mismo tiempo
+            cls.objects.filter(date=invoice.date).update(**totals)
+
+
+class DashboardCounter(models.Model):
+    """
+    Cantidad de filas de un modelo con un mismo valor, para las estadísticas
+    de la página de inicio (app/dashboard.py).
+    """
+    group = models.CharField(max_length=30)
+    key = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["group", "key"], name="dashboard_counter_unique"),
+        ]
+
+    def __str__(self):
+        """Retorna la representación en cadena del contador"""
+        return f"{self.group} {self.key}: {self.count}"
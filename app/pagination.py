@@ -0,0 +1,187 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(values):
+    """Codifica los valores de la clave de orden en un cursor opaco para la URL"""
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decodifica un cursor generado por encode_cursor"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as error:
+        raise Http404("Cursor de paginación inválido") from error
+
+    if not isinstance(values, list) or len(values) == 0:
+        raise Http404("Cursor de paginación inválido")
+
+    return values
+
+
+class KeysetPage:
+    """Representa una página de resultados obtenida con paginación por cursor"""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, query):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.query = query
+
+    def __iter__(self):
+        """Itera sobre los objetos de la página"""
+        return iter(self.object_list)
+
+    def __len__(self):
+        """Retorna la cantidad de objetos de la página"""
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        """Indica si existe una página siguiente"""
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        """Indica si existe una página anterior"""
+        return self.previous_cursor is not None
+
+    def _url(self, param, cursor):
+        query = self.query.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query[param] = cursor
+        return "?" + query.urlencode()
+
+    @property
+    def next_url(self):
+        """Retorna la URL relativa de la página siguiente"""
+        if not self.has_next:
+            return None
+        return self._url("after", self.next_cursor)
+
+    @property
+    def previous_url(self):
+        """Retorna la URL relativa de la página anterior"""
+        if not self.has_previous:
+            return None
+        return self._url("before", self.previous_cursor)
+
+
+def _keyset_filter(key_fields, values, forward):
+    """
+    Construye la condición "fila posterior (o anterior) al cursor".
+
+    La condición sobre el primer campo se expresa como rango (>= / <=) para que
+    la base de datos pueda usar el índice y comenzar la búsqueda en el cursor.
+    """
+    operator = "gt" if forward else "lt"
+    inclusive = "gte" if forward else "lte"
+
+    after = Q()
+    for index in reversed(range(len(key_fields))):
+        condition = Q(**{f"{key_fields[index]}__{operator}": values[index]})
+        if index < len(key_fields) - 1:
+            condition |= Q(**{key_fields[index]: values[index]}) & after
+        after = condition
+
+    if len(key_fields) == 1:
+        return after
+
+    return Q(**{f"{key_fields[0]}__{inclusive}": values[0]}) & after
+
+
+def _cursor_values(model, key_fields, values):
+    """
+    Convierte los valores de un cursor al tipo de cada campo de la clave.
+
+    El cursor llega en la URL y puede estar alterado: un valor que el campo no
+    acepta (texto en una fecha, un entero fuera de rango) respondería con un
+    error 500 al armar o ejecutar la consulta.
+    """
+    if len(values) != len(key_fields):
+        raise Http404("Cursor de paginación inválido")
+
+    converted = []
+    for field_name, value in zip(key_fields, values):
+        field = model._meta.get_field(field_name)
+        try:
+            value = field.to_python(value)
+            field.run_validators(value)
+        except (ValidationError, TypeError, ValueError) as error:
+            raise Http404("Cursor de paginación inválido") from error
+        if value is None:
+            raise Http404("Cursor de paginación inválido")
+        converted.append(value)
+    return converted
+
+
+def _page_query(request, queryset, key, per_page):
+    """Arma la consulta de la página: per_page + 1 filas a partir del cursor"""
+    if per_page is None:
+        per_page = getattr(settings, "REPOSITORY_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+
+    key_fields = [key] if key == "id" else [key, "id"]
+    after = request.GET.get("after")
+    before = request.GET.get("before")
+
+    forward = before is None
+    cursor = after if forward else before
+    ordering = key_fields if forward else [f"-{field}" for field in key_fields]
+
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = _cursor_values(queryset.model, key_fields, decode_cursor(cursor))
+        queryset = queryset.filter(_keyset_filter(key_fields, values, forward))
+
+    return queryset[:per_page + 1], key_fields, forward, cursor, per_page
+
+
+def _build_page(request, rows, key_fields, forward, cursor, per_page):
+    """Arma la página y sus cursores a partir de las filas leídas"""
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if not forward:
+        rows.reverse()
+
+    def cursor_for(obj):
+        return encode_cursor([getattr(obj, field) for field in key_fields])
+
+    next_cursor = None
+    previous_cursor = None
+    if rows:
+        if has_more or not forward:
+            next_cursor = cursor_for(rows[-1])
+        if (forward and cursor) or (not forward and has_more):
+            previous_cursor = cursor_for(rows[0])
+
+    return KeysetPage(rows, next_cursor, previous_cursor, request.GET)
+
+
+def paginate(request, queryset, key="id", per_page=None):
+    """
+    Pagina un queryset por cursor (keyset) ordenando por `key` y luego por `id`.
+
+    El costo de cada página es constante: en lugar de OFFSET se filtra a partir
+    de los valores de la última fila vista, lo que usa el índice de la clave.
+    """
+    queryset, *state = _page_query(request, queryset, key, per_page)
+    return _build_page(request, list(queryset), *state)
+
+
+async def apaginate(request, queryset, key="id", per_page=None):
+    """Versión asíncrona de paginate, que lee las filas con aiterator()"""
+    queryset, *state = _page_query(request, queryset, key, per_page)
+    return _build_page(request, [obj async for obj in queryset.aiterator()], *state)
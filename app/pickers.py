@@ -0,0 +1,40 @@
+from asgiref.sync import sync_to_async
+
+from .search import search_ids
+from .validation import parse_digits
+
+# Opciones que muestra cada selector de los formularios; el resto se encuentra
+# escribiendo parte del nombre en el buscador del selector
+PICKER_LIMIT = 50
+
+
+def picker_choices(queryset, fields, query="", selected=(), search_kind=None):
+    """
+    Retorna las opciones de un selector: (id, *fields) de hasta PICKER_LIMIT filas
+    ordenadas por nombre.
+
+    Con `query` se listan solo las filas cuyo nombre lo contiene (o, si el modelo
+    tiene índice de texto completo, las que encuentra ese índice con
+    `search_kind`). Las filas de `selected` siempre se incluyen, para no perder la
+    opción elegida al volver a mostrar el formulario.
+    """
+    queryset = queryset.order_by("name", "pk")
+    query = query.strip()
+    rows = queryset
+    if query and search_kind:
+        rows = rows.filter(pk__in=search_ids(search_kind, query, PICKER_LIMIT))
+    elif query:
+        rows = rows.filter(name__icontains=query)
+    rows = list(rows.values_list("pk", *fields)[:PICKER_LIMIT])
+
+    shown = {row[0] for row in rows}
+    missing = {parse_digits(value) for value in selected} - shown - {None}
+    if missing:
+        rows += queryset.filter(pk__in=missing).values_list("pk", *fields)
+
+    return [(str(pk), *values) for pk, *values in rows]
+
+
+async def apicker_choices(queryset, fields, query="", selected=(), search_kind=None):
+    """Versión asíncrona de picker_choices"""
+    return await sync_to_async(picker_choices)(queryset, fields, query, selected, search_kind)
@@ -0,0 +1,53 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Indica si las lecturas de la petición en curso pueden ir a una réplica
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Envía (o no) a las réplicas las lecturas ejecutadas dentro del bloque"""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def reading_from_replica():
+    """Indica si las lecturas de la petición en curso van a una réplica"""
+    return bool(settings.REPLICA_DATABASES) and _read_from_replica.get()
+
+
+class ReplicaRouter:
+    """
+    Envía las lecturas a una réplica cuando la petición lo permite.
+
+    Las escrituras y las lecturas fuera de una petición GET (formularios,
+    comandos, migraciones) usan siempre la base "default". Las réplicas no se
+    migran: reciben el esquema de la base principal por replicación.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Retorna una réplica al azar si las lecturas pueden ir a réplicas"""
+        if reading_from_replica():
+            return random.choice(settings.REPLICA_DATABASES)
+        return None
+
+    def db_for_write(self, model, **hints):
+        """Retorna la base principal para toda escritura"""
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Permite relaciones entre objetos leídos de la principal o de réplicas"""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Impide migrar las réplicas"""
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
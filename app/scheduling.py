@@ -0,0 +1,171 @@
+"""
+Búsqueda de turnos libres de todos los veterinarios.
+
+Los turnos se guardan en memoria en un índice de intervalos: por cada
+veterinario, una lista ordenada por inicio de sus turnos. Buscar huecos en un
+rango de fechas recorre esas listas con bisect en lugar de consultar la base
+por cada veterinario y horario.
+
+El índice se mantiene al día desde la base de forma incremental: las versiones
+de Appointment y Vet (app/cache.py) indican si hubo escrituras; cuando
+cambian se leen solo los turnos modificados desde la última lectura y la
+cantidad de turnos vigentes, que delata si hubo eliminaciones.
+"""
+
+import datetime
+import threading
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from django.utils import timezone
+
+from .cache import model_versions
+from .models import APPOINTMENT_MINUTES, Appointment, Vet
+
+Slot = namedtuple("Slot", ["vet_id", "start", "end"])
+
+# Margen con el que se releen los turnos modificados, para no perder los de
+# transacciones que confirmaron después de la lectura anterior
+SYNC_MARGIN = datetime.timedelta(minutes=5)
+
+
+class AvailabilityIndex:
+    """
+    Índice en memoria de los turnos de cada veterinario.
+
+    Los turnos de un mismo veterinario no se superponen (lo garantiza
+    Appointment.save_appointment), por lo que alcanza con mirar el turno
+    anterior y el siguiente a un horario para saber si está ocupado.
+    """
+
+    def __init__(self):
+        self.hours = {}
+        self.busy = {}
+        self.appointments = {}
+        self.versions = None
+        self.synced_at = None
+        self.horizon = None
+        self.lock = threading.Lock()
+
+    def set_hours(self, vet_id, opening, closing):
+        """Registra el horario de atención de un veterinario"""
+        self.hours[vet_id] = (opening, closing)
+
+    def add(self, appointment_id, vet_id, start, end):
+        """Agrega (o reemplaza) un turno"""
+        self.remove(appointment_id)
+        insort(self.busy.setdefault(vet_id, []), (start, end, appointment_id))
+        self.appointments[appointment_id] = (vet_id, start, end)
+
+    def remove(self, appointment_id):
+        """Quita un turno, si está en el índice"""
+        entry = self.appointments.pop(appointment_id, None)
+        if entry is None:
+            return
+        vet_id, start, end = entry
+        intervals = self.busy[vet_id]
+        del intervals[bisect_left(intervals, (start, end, appointment_id))]
+
+    def is_free(self, vet_id, start, end):
+        """Indica si el veterinario no tiene turnos entre start y end"""
+        intervals = self.busy.get(vet_id, ())
+        index = bisect_left(intervals, (start,))
+        if index > 0 and intervals[index - 1][1] > start:
+            return False
+        return index == len(intervals) or intervals[index][0] >= end
+
+    def free_slots(self, date_from, date_to, duration=None, vet_ids=None, after=None):
+        """
+        Retorna los turnos libres entre dos fechas (inclusive), por día y veterinario.
+
+        Los horarios se alinean a la duración desde la apertura de cada
+        veterinario; con `after` se descartan los que empiezan antes.
+        """
+        duration = duration or datetime.timedelta(minutes=APPOINTMENT_MINUTES)
+        vets = sorted(self.hours if vet_ids is None else set(vet_ids) & self.hours.keys())
+        tz = timezone.get_current_timezone()
+        slots = []
+
+        day = date_from
+        while day <= date_to:
+            # La mayoría de los veterinarios comparten horario: se arma una vez por día
+            bounds = {}
+            for vet_id in vets:
+                hours = self.hours[vet_id]
+                if hours not in bounds:
+                    bounds[hours] = tuple(
+                        datetime.datetime.combine(day, time, tzinfo=tz) for time in hours
+                    )
+                slot, day_end = bounds[hours]
+
+                intervals = self.busy.get(vet_id, ())
+                count = len(intervals)
+                index = bisect_left(intervals, (slot,))
+                if index > 0 and intervals[index - 1][1] > slot:
+                    index -= 1
+
+                slot_end = slot + duration
+                while slot_end <= day_end:
+                    while index < count and intervals[index][1] <= slot:
+                        index += 1
+                    if (index == count or intervals[index][0] >= slot_end) and (
+                        after is None or slot >= after
+                    ):
+                        slots.append(Slot(vet_id, slot, slot_end))
+                    slot, slot_end = slot_end, slot_end + duration
+            day += datetime.timedelta(days=1)
+
+        return slots
+
+    def sync(self):
+        """Incorpora los cambios de la base desde la última sincronización"""
+        versions = model_versions(Appointment, Vet)
+        if versions == self.versions:
+            return
+
+        now = timezone.now()
+        if self.versions is None or versions[1] != self.versions[1]:
+            self.hours = {}
+            for vet_id, opening, closing in Vet.objects.values_list(
+                "pk", "opening_time", "closing_time",
+            ):
+                self.set_hours(vet_id, opening, closing)
+
+        # Solo interesan los turnos desde el día de la primera lectura en adelante
+        if self.horizon is None:
+            self.horizon = now - datetime.timedelta(days=1)
+            changed = Appointment.objects.filter(end__gte=self.horizon)
+        else:
+            changed = Appointment.objects.filter(
+                end__gte=self.horizon, updated_at__gte=self.synced_at - SYNC_MARGIN,
+            )
+
+        for appointment_id, vet_id, start, end in changed.values_list(
+            "pk", "vet_id", "start", "end",
+        ):
+            self.add(appointment_id, vet_id, start, end)
+
+        # Con los cambios aplicados el índice contiene todos los turnos de la
+        # base: si hay más es que se eliminaron turnos, y recién ahí se leen los ids
+        current = Appointment.objects.filter(end__gte=self.horizon)
+        if current.count() != len(self.appointments):
+            for appointment_id in self.appointments.keys() - set(
+                current.values_list("pk", flat=True),
+            ):
+                self.remove(appointment_id)
+
+        self.versions = versions
+        self.synced_at = now
+
+
+# Índice compartido por las peticiones del proceso
+availability = AvailabilityIndex()
+
+
+def find_free_slots(date_from, date_to, vet_ids=None, duration=None):
+    """Retorna los turnos libres desde ahora entre dos fechas, con el índice al día"""
+    with availability.lock:
+        availability.sync()
+        return availability.free_slots(
+            date_from, date_to, duration=duration, vet_ids=vet_ids, after=timezone.now(),
+        )
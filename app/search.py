@@ -0,0 +1,215 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from .models import Client, Medicine, Product, Provider
+
+# Índices de texto completo: tipo de resultado -> (tabla, columnas, pesos de bm25)
+SEARCH_INDEXES = {
+    "medicine": ("app_medicine", ("name", "description"), (10.0, 1.0)),
+    "product": ("app_product", ("name", "type"), (10.0, 2.0)),
+    "provider": ("app_provider", ("name", "address"), (10.0, 1.0)),
+    "client": ("app_client", ("name",), (1.0,)),
+}
+
+SEARCH_RESULT_TYPES = {
+    "medicine": (Medicine, "Medicamento", "medicines_edit"),
+    "product": (Product, "Producto", "products_edit"),
+    "provider": (Provider, "Proveedor", "providers_edit"),
+    "client": (Client, "Cliente", "clients_edit"),
+}
+
+SEARCH_LIMIT = 50
+
+# Marcadores que delimitan los términos encontrados dentro del fragmento
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def fts_table(table):
+    """Retorna el nombre de la tabla FTS5 asociada a una tabla del modelo"""
+    return f"{table}_fts"
+
+
+def _trigger_statements(table, columns):
+    fts = fts_table(table)
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+
+    return {
+        f"{fts}_ai": f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+                     f"BEGIN {insert_new} END",
+        f"{fts}_ad": f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+                     f"BEGIN {delete_old} END",
+        # Solo las columnas indexadas: los cambios de stock no tocan el índice
+        f"{fts}_au": f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+                     f"BEGIN {delete_old} {insert_new} END",
+    }
+
+
+def drop_search_index(conn):
+    """Elimina las tablas FTS5 y sus triggers"""
+    if conn.vendor != "sqlite":
+        return
+
+    with conn.cursor() as cursor:
+        for table, columns, _ in SEARCH_INDEXES.values():
+            for trigger in _trigger_statements(table, columns):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table(table)}")
+
+
+def ensure_search_triggers(conn):
+    """
+    Reinstala los triggers que falten y reindexa las tablas afectadas.
+
+    SQLite descarta los triggers cuando una migración reconstruye la tabla
+    (por ejemplo al agregar una columna con valor por defecto), por lo que se
+    verifica después de cada migrate.
+    """
+    if conn.vendor != "sqlite":
+        return
+
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for table, columns, _ in SEARCH_INDEXES.values():
+            fts = fts_table(table)
+            if fts not in existing:
+                continue
+
+            triggers = _trigger_statements(table, columns)
+            missing = [name for name in triggers if name not in existing]
+            for name in missing:
+                cursor.execute(triggers[name])
+            if missing:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def build_match_query(text):
+    """Convierte el texto ingresado en una consulta FTS5 segura (prefijos con AND)"""
+    tokens = TOKEN_PATTERN.findall(text)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _highlight(fragment):
+    return (
+        escape(fragment)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_END, "</mark>")
+    )
+
+
+class SearchResult:
+    """Un resultado de la búsqueda de texto completo"""
+
+    def __init__(self, kind, object_id, title, snippet, rank):
+        self.kind = kind
+        self.object_id = object_id
+        self.title = title
+        self.snippet = snippet
+        self.rank = rank
+
+    @property
+    def label(self):
+        """Retorna el nombre del tipo de resultado"""
+        return SEARCH_RESULT_TYPES[self.kind][1]
+
+    @property
+    def url_name(self):
+        """Retorna el nombre de la URL de edición del resultado"""
+        return SEARCH_RESULT_TYPES[self.kind][2]
+
+
+def _search_fts(match, limit):
+    selects = []
+    params = []
+    for kind, (table, columns, weights) in SEARCH_INDEXES.items():
+        fts = fts_table(table)
+        last_column = len(columns) - 1
+        selects.append(
+            f"SELECT '{kind}', rowid, {columns[0]}, "
+            f"snippet({fts}, {last_column}, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 12), "
+            f"bm25({fts}, {', '.join(str(weight) for weight in weights)}) AS rank "
+            f"FROM {fts} WHERE {fts} MATCH %s",
+        )
+        params.append(match)
+
+    sql = " UNION ALL ".join(selects) + " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            SearchResult(kind, object_id, title, _highlight(snippet or ""), rank)
+            for kind, object_id, title, snippet, rank in cursor.fetchall()
+        ]
+
+
+def _fallback_queryset(kind, tokens):
+    columns = SEARCH_INDEXES[kind][1]
+    condition = Q()
+    for token in tokens:
+        token_condition = Q()
+        for column in columns:
+            token_condition |= Q(**{f"{column}__icontains": token})
+        condition &= token_condition
+    return SEARCH_RESULT_TYPES[kind][0].objects.filter(condition)
+
+
+def _search_fallback(tokens, limit):
+    results = []
+    for kind, (_, columns, _) in SEARCH_INDEXES.items():
+        for obj in _fallback_queryset(kind, tokens)[:limit]:
+            snippet = escape(getattr(obj, columns[-1]))
+            results.append(SearchResult(kind, obj.pk, obj.name, snippet, 0))
+
+    return results[:limit]
+
+
+def search_ids(kind, text, limit=SEARCH_LIMIT):
+    """Retorna los ids de un tipo de resultado que coinciden con el texto, por relevancia"""
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return []
+
+    table, columns, weights = SEARCH_INDEXES[kind]
+    if connection.vendor == "sqlite":
+        fts = fts_table(table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s "
+                f"ORDER BY bm25({fts}, {', '.join(str(weight) for weight in weights)}) LIMIT %s",
+                [build_match_query(text), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    return list(_fallback_queryset(kind, tokens).values_list("pk", flat=True)[:limit])
+
+
+def search(text, limit=SEARCH_LIMIT):
+    """
+    Busca el texto en medicamentos, productos, proveedores y clientes.
+
+    En SQLite usa los índices FTS5 ordenados por relevancia (bm25); en otros
+    motores recurre a búsquedas icontains.
+    """
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return []
+
+    if connection.vendor == "sqlite":
+        return _search_fts(build_match_query(text), limit)
+
+    return _search_fallback(tokens, limit)
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .dashboard import COUNTERS, ensure_counters, record_deleted, record_saved
+from .models import (
+    Appointment,
+    Client,
+    DashboardCounter,
+    Invoice,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    Vet,
+)
+from .search import ensure_search_triggers
+
+# Modelos cuyos listados se guardan en la caché de repositorios (sus versiones
+# también indican a app.scheduling cuándo releer turnos y horarios)
+CACHED_MODELS = (Client, Pet, Product, Provider, Vet, Medicine, Appointment, Invoice)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Reinstala los triggers FTS5 que una migración haya descartado"""
+    if sender.name != "app":
+        return
+    ensure_search_triggers(connections[using])
+
+
+@receiver(post_migrate)
+def create_dashboard_counters(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Calcula las estadísticas de inicio la primera vez que se migra la base"""
+    if sender.name != "app":
+        return
+    # Al revertir migraciones anteriores al dashboard la tabla ya no existe
+    if DashboardCounter._meta.db_table not in connections[using].introspection.table_names():
+        return
+    ensure_counters(using)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Aplica los PRAGMA del perfil de SQLite configurado a cada conexión nueva"""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+def invalidate_repository_cache(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Invalida los listados en caché del modelo que se guardó o eliminó, al
+    confirmarse la transacción: si se invalidara antes, una lectura concurrente
+    guardaría las filas viejas bajo la versión nueva hasta la próxima escritura.
+    """
+    transaction.on_commit(lambda: invalidate(sender), using=using)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_repository_cache, sender=model)
+    post_delete.connect(invalidate_repository_cache, sender=model)
+
+for model in dict.fromkeys(model for model, _, _ in COUNTERS.values()):
+    post_save.connect(record_saved, sender=model)
+    post_delete.connect(record_deleted, sender=model)
@@ -1,7 +1,32 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from asyncio import iscoroutinefunction
+from io import StringIO
+from pathlib import Path
+
+import brotli
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
 
-from app.models import Client, Medicine, Product, Provider, Vet, Pet, Breed, City
+from app import scheduling
+from app.cache import model_versions
+from app.management.commands import vendor_static
+from app.pagination import encode_cursor
+from app.pickers import PICKER_LIMIT
+from app.routers import replica_reads
+from app.models import Appointment, Client, DailySales, DashboardCounter, Invoice, Medicine, Product, Provider, Vet, Pet, Breed, City
 import datetime
 
 
@@ -418,3 +443,1276 @@ class PetTest(TestCase):
         self.assertEqual(pets[2].name, "Bird Pet")
         self.assertEqual(pets[2].breed, Breed.BIRD)
         self.assertEqual(pets[2].birthday, datetime.date(2022, 1, 1))
+
+
+@override_settings(REPOSITORY_PAGE_SIZE=2)
+class RepositoryPaginationTest(TestCase):
+    def setUp(self):
+        for name in ["Ana", "Bruno", "Carla", "Diego", "Elena"]:
+            Client.objects.create(
+                name=name,
+                phone=54221555232,
+                email=f"{name.lower()}@vetsoft.com",
+                city=City.LA_PLATA,
+            )
+
+    def test_first_page_is_limited_to_page_size(self):
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertEqual(
+            [client.name for client in response.context["clients"]], ["Ana", "Bruno"])
+        self.assertTrue(response.context["page"].has_next)
+        self.assertFalse(response.context["page"].has_previous)
+
+    def test_can_walk_forward_and_back_with_cursors(self):
+        first = self.client.get(reverse("clients_repo")).context["page"]
+        second = self.client.get(reverse("clients_repo") + first.next_url).context["page"]
+        third = self.client.get(reverse("clients_repo") + second.next_url).context["page"]
+
+        self.assertEqual([c.name for c in second], ["Carla", "Diego"])
+        self.assertEqual([c.name for c in third], ["Elena"])
+        self.assertFalse(third.has_next)
+
+        back = self.client.get(reverse("clients_repo") + third.previous_url).context["page"]
+        self.assertEqual([c.name for c in back], ["Carla", "Diego"])
+        self.assertTrue(back.has_next)
+        self.assertTrue(back.has_previous)
+
+        start = self.client.get(reverse("clients_repo") + back.previous_url).context["page"]
+        self.assertEqual([c.name for c in start], ["Ana", "Bruno"])
+        self.assertFalse(start.has_previous)
+
+    def test_cursor_is_stable_when_earlier_rows_are_deleted(self):
+        first = self.client.get(reverse("clients_repo")).context["page"]
+        Client.objects.filter(name="Ana").delete()
+
+        second = self.client.get(reverse("clients_repo") + first.next_url).context["page"]
+        self.assertEqual([c.name for c in second], ["Carla", "Diego"])
+
+    def test_invalid_cursor_responds_404(self):
+        response = self.client.get(reverse("clients_repo"), {"after": "no-es-un-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values_respond_404(self):
+        tampered = [
+            ("clients_repo", {}, ["uno"]),
+            ("clients_repo", {}, [10**30]),
+            ("clients_repo", {}, [[1]]),
+            ("clients_repo", {"sort": "name"}, ["Bruno", None]),
+            ("pets_repo", {"sort": "birthday"}, ["no-es-una-fecha", 1]),
+            ("products_repo", {"sort": "price"}, [{"precio": 1}, 1]),
+        ]
+        for name, params, values in tampered:
+            for param in ("after", "before"):
+                with self.subTest(name=name, values=values, param=param):
+                    response = self.client.get(
+                        reverse(name), {**params, param: encode_cursor(values)},
+                    )
+                    self.assertEqual(response.status_code, 404)
+
+    def test_all_repositories_are_paginated(self):
+        for name in ["pets_repo", "products_repo", "providers_repo", "vets_repo", "medicines_repo"]:
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("page", response.context)
+
+
+class RepositoryFilterTest(TestCase):
+    def test_can_filter_clients_by_city_and_name_prefix(self):
+        Client.objects.create(name="Juan", phone=54221, email="juan@vetsoft.com", city=City.BERISSO)
+        Client.objects.create(name="Julia", phone=54221, email="julia@vetsoft.com", city=City.LA_PLATA)
+        Client.objects.create(name="Pedro", phone=54221, email="pedro@vetsoft.com", city=City.BERISSO)
+
+        response = self.client.get(reverse("clients_repo"), {"city": City.BERISSO, "name": "Ju"})
+
+        self.assertEqual([c.name for c in response.context["clients"]], ["Juan"])
+        self.assertContains(response, 'value="Ju"')
+
+    def test_can_filter_products_by_price_range(self):
+        Product.objects.create(name="Collar", type="Accesorio", price=30)
+        Product.objects.create(name="Correa", type="Accesorio", price=10)
+        Product.objects.create(name="Alimento", type="Comida", price=50)
+
+        response = self.client.get(
+            reverse("products_repo"), {"price_min": "5", "price_max": "40"})
+
+        self.assertEqual([p.name for p in response.context["products"]], ["Correa", "Collar"])
+
+    def test_pagination_links_keep_the_filters(self):
+        for name in ["Ana", "Andrea", "Antonio"]:
+            Client.objects.create(name=name, phone=54221, email="a@vetsoft.com", city=City.BERISSO)
+
+        with self.settings(REPOSITORY_PAGE_SIZE=2):
+            response = self.client.get(reverse("clients_repo"), {"name": "An"})
+
+        self.assertIn("name=An", response.context["page"].next_url)
+
+
+class SearchTest(TestCase):
+    def test_search_page_lists_ranked_results(self):
+        medicine = Medicine.objects.create(name="Amoxicilina", description="Antibiótico", dose=5)
+
+        response = self.client.get(reverse("search"), {"q": "amoxi"})
+
+        self.assertTemplateUsed(response, "search.html")
+        self.assertContains(response, reverse("medicines_edit", kwargs={"id": medicine.id}))
+
+    def test_search_page_without_results(self):
+        response = self.client.get(reverse("search"), {"q": "inexistente"})
+        self.assertContains(response, "No se encontraron resultados")
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        Client.objects.create(name="Juan", phone=54221, email="juan@vetsoft.com", city=City.BERISSO)
+        Client.objects.create(name="Ana", phone=54222, email="ana@vetsoft.com", city=City.ENSENADA)
+
+    def test_streams_clients_as_csv(self):
+        response = self.client.get(
+            reverse("export", kwargs={"name": "clients", "export_format": "csv"}))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,phone,email,city")
+        self.assertEqual(lines[1].split(",")[1:], ["Juan", "54221", "juan@vetsoft.com", "Berisso"])
+        self.assertEqual(len(lines), 3)
+
+    def test_streams_products_as_ndjson(self):
+        Product.objects.create(name="Collar", type="Accesorio", price=10.5)
+
+        response = self.client.get(
+            reverse("export", kwargs={"name": "products", "export_format": "ndjson"}))
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(rows, [{"id": rows[0]["id"], "name": "Collar", "type": "Accesorio", "price": 10.5, "stock": 0}])
+
+    def test_unknown_export_responds_404(self):
+        response = self.client.get(
+            reverse("export", kwargs={"name": "users", "export_format": "csv"}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_command_writes_every_row(self):
+        output = StringIO()
+        call_command("export", "clients", "--format", "ndjson", "--chunk-size", "1", stdout=output)
+
+        names = [json.loads(line)["name"] for line in output.getvalue().splitlines()]
+        self.assertEqual(names, ["Juan", "Ana"])
+
+
+class ImportTest(TestCase):
+    def test_upload_imports_products_and_shows_report(self):
+        upload = SimpleUploadedFile(
+            "productos.csv",
+            "name,type,price\nCollar,Accesorio,10\nCorrea,Accesorio,-1\n".encode(),
+            content_type="text/csv",
+        )
+
+        response = self.client.post(reverse("import"), {"model": "products", "file": upload})
+
+        self.assertTemplateUsed(response, "imports/form.html")
+        self.assertEqual(response.context["report"].created, 1)
+        self.assertContains(response, "El precio debe ser mayor a cero")
+        self.assertEqual(Product.objects.get().name, "Collar")
+
+    def test_upload_that_is_not_utf8_shows_a_file_error(self):
+        upload = SimpleUploadedFile(
+            "productos.csv", "name,type,price\nCollar,Accesorio,10\nCaña,Accesorio,5\n".encode("latin-1"),
+            content_type="text/csv",
+        )
+
+        response = self.client.post(reverse("import"), {"model": "products", "file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "El archivo debe estar codificado en UTF-8")
+
+    def test_upload_requires_model_and_file(self):
+        response = self.client.post(reverse("import"), {})
+
+        self.assertContains(response, "Por favor seleccione un modelo")
+        self.assertContains(response, "Por favor seleccione un archivo CSV")
+
+    def test_import_command_round_trips_an_export(self):
+        Medicine.objects.create(name="Amoxicilina", description="Antibiotico", dose=5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "medicines.csv")
+            call_command("export", "medicines", "--output", path)
+            Medicine.objects.all().delete()
+
+            call_command("import_csv", "medicines", path, stdout=StringIO())
+
+        self.assertEqual(Medicine.objects.get().name, "Amoxicilina")
+
+
+class DeleteTest(TestCase):
+    def test_delete_runs_a_single_delete_statement(self):
+        client = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("clients_delete"), {"client_id": client.id})
+
+        deletes = [query for query in queries if query["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+        self.assertRedirects(response, reverse("clients_repo"))
+        self.assertFalse(Client.objects.exists())
+
+    def test_bulk_delete_query_count_does_not_grow_with_selection(self):
+        ids = [
+            Provider.objects.create(name=f"Proveedor {i}", email="p@vetsoft.com", address="Calle 1").id
+            for i in range(10)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse("providers_bulk_delete"), {"ids": ids})
+
+        deletes = [query for query in queries if query["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+        self.assertFalse(Provider.objects.exists())
+
+    def test_delete_missing_row_returns_404(self):
+        response = self.client.post(reverse("providers_delete"), {"provider_id": 999})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_delete_removes_selected_rows_and_reports_count(self):
+        products = [
+            Product.objects.create(name=f"Producto {i}", type="Alimento", price=10)
+            for i in range(3)
+        ]
+
+        response = self.client.post(
+            reverse("products_bulk_delete"),
+            {"ids": [products[0].id, products[2].id, "x", 999]},
+            follow=True,
+        )
+
+        self.assertEqual(list(Product.objects.values_list("id", flat=True)), [products[1].id])
+        self.assertContains(response, "Se eliminaron 2 productos")
+
+    def test_bulk_delete_ignores_values_that_are_not_ids(self):
+        product = Product.objects.create(name="Collar", type="Accesorio", price=10)
+
+        response = self.client.post(
+            reverse("products_bulk_delete"),
+            {"ids": [product.id, "9" * 30, "²", "١٢", "-1"]},
+            follow=True,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Se eliminaron 1 productos")
+        self.assertFalse(Product.objects.exists())
+
+    def test_delete_with_a_missing_or_malformed_id_is_not_found(self):
+        product = Product.objects.create(name="Collar", type="Accesorio", price=10)
+
+        for data in ({}, {"product_id": "9" * 30}, {"product_id": "²"}, {"product_id": "-1"}):
+            response = self.client.post(reverse("products_delete"), data)
+
+            self.assertEqual(response.status_code, 404)
+        self.assertTrue(Product.objects.filter(pk=product.id).exists())
+
+    def test_bulk_delete_without_selection_deletes_nothing(self):
+        Medicine.objects.create(name="Amoxicilina", description="Antibiotico", dose=5)
+
+        response = self.client.post(reverse("medicines_bulk_delete"), follow=True)
+
+        self.assertContains(response, "Se eliminaron 0 medicamentos")
+        self.assertEqual(Medicine.objects.count(), 1)
+
+    def test_bulk_delete_requires_post(self):
+        response = self.client.get(reverse("vets_bulk_delete"))
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_repository_renders_selection_checkboxes(self):
+        pet = Pet.objects.create(name="Firulais", breed=Breed.DOG, birthday="2020-01-01")
+
+        response = self.client.get(reverse("pets_repo"))
+
+        self.assertContains(response, 'id="pets-bulk-delete"')
+        self.assertContains(response, f'name="ids" value="{pet.id}"')
+
+
+REPOSITORY_CACHE_SETTINGS = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "fragments": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "repository": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "repository-tests",
+        "OPTIONS": {"MAX_ENTRIES": 100},
+    },
+}
+
+
+@override_settings(CACHES=REPOSITORY_CACHE_SETTINGS)
+class RepositoryCacheTest(TestCase):
+    def setUp(self):
+        caches["repository"].clear()
+        self.product = Product.objects.create(name="Collar", type="Accesorio", price=10)
+
+    def test_repeated_view_does_not_query_the_database(self):
+        self.client.get(reverse("products_repo"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("products_repo"))
+
+        self.assertContains(response, "Collar")
+
+    def test_filters_and_cursor_are_cached_separately(self):
+        self.client.get(reverse("products_repo"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("products_repo"), {"type": "Alimento"})
+
+        self.assertNotContains(response, "Collar")
+
+    def test_save_invalidates_the_model_pages(self):
+        self.client.get(reverse("products_repo"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "Correa"
+            self.product.save()
+        response = self.client.get(reverse("products_repo"))
+
+        self.assertContains(response, "Correa")
+        self.assertNotContains(response, "Collar")
+
+    def test_delete_invalidates_the_model_pages(self):
+        self.client.get(reverse("products_repo"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("products_delete"), {"product_id": self.product.id})
+        response = self.client.get(reverse("products_repo"))
+
+        self.assertNotContains(response, "Collar")
+
+    def test_version_changes_only_when_the_write_commits(self):
+        version = model_versions(Product)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.product.name = "Correa"
+            self.product.save()
+            # Una lectura concurrente antes del commit no debe ver la versión nueva
+            self.assertEqual(model_versions(Product), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(model_versions(Product), version)
+
+    def test_import_invalidates_the_model_pages(self):
+        self.client.get(reverse("products_repo"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_csv", "products", self._csv("name,type,price\nHueso,Juguete,5\n"),
+                         stdout=StringIO())
+        response = self.client.get(reverse("products_repo"))
+
+        self.assertContains(response, "Hueso")
+
+    def test_writes_to_other_models_keep_the_page(self):
+        self.client.get(reverse("products_repo"))
+
+        Medicine.objects.create(name="Amoxicilina", description="Antibiotico", dose=5)
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse("products_repo"))
+
+    def _csv(self, content):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "data.csv")
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+
+@override_settings(CACHES=REPOSITORY_CACHE_SETTINGS)
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        caches["repository"].clear()
+        self.client.cookies["csrftoken"] = "a" * 32
+        self.vet = Vet.objects.create(
+            name="Dr. Michael Smith", phone="221555232", email="smith@vetsoft.com",
+            address="Calle 13", speciality="General",
+        )
+
+    def test_repository_answers_304_without_querying(self):
+        etag = self.client.get(reverse("vets_repo"))["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("vets_repo"), headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_page_etag_changes_after_a_write(self):
+        url = reverse("vets_edit", kwargs={"id": self.vet.id})
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vet.name = "Dr. John Doe"
+            self.vet.save()
+        response = self.client.get(url, headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_query_and_csrf_cookie(self):
+        etag = self.client.get(reverse("vets_repo"))["ETag"]
+
+        self.assertNotEqual(self.client.get(reverse("vets_repo"), {"sort": "name"})["ETag"], etag)
+        self.client.cookies["csrftoken"] = "b" * 32
+        self.assertNotEqual(self.client.get(reverse("vets_repo"))["ETag"], etag)
+
+    def test_pages_are_revalidated_on_every_navigation(self):
+        response = self.client.get(reverse("vets_repo"))
+
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_no_etag_without_csrf_cookie(self):
+        del self.client.cookies["csrftoken"]
+
+        response = self.client.get(reverse("vets_repo"))
+
+        self.assertFalse(response.has_header("ETag"))
+
+
+@override_settings(ROOT_URLCONF="app.urls_async")
+class AsyncViewsTest(TestCase):
+    def test_families_resolve_to_async_views(self):
+        for name in ("clients_repo", "pets_form", "vets_delete", "products_bulk_delete"):
+            self.assertTrue(iscoroutinefunction(resolve(reverse(name)).func), name)
+
+    async def test_repository_lists_rows(self):
+        await Product.objects.acreate(name="Collar", type="Accesorio", price=10)
+
+        response = await self.async_client.get(reverse("products_repo"), {"type": "Accesorio"})
+
+        self.assertContains(response, "Collar")
+
+    async def test_form_creates_and_edits(self):
+        response = await self.async_client.post(
+            reverse("clients_form"),
+            {
+                "name": "Juan Sebastian Veron",
+                "phone": "54221555232",
+                "email": "brujita75@vetsoft.com",
+                "city": City.LA_PLATA,
+            },
+        )
+        self.assertRedirects(response, reverse("clients_repo"), fetch_redirect_response=False)
+
+        client = await Client.objects.aget()
+        response = await self.async_client.get(reverse("clients_edit", kwargs={"id": client.id}))
+        self.assertContains(response, "Juan Sebastian Veron")
+
+    async def test_form_shows_validation_errors(self):
+        response = await self.async_client.post(
+            reverse("vets_form"), {"name": "", "phone": "", "email": "", "address": ""},
+        )
+
+        self.assertContains(response, "Por favor ingrese un nombre")
+        self.assertFalse(await Vet.objects.aexists())
+
+    async def test_edit_missing_row_returns_404(self):
+        response = await self.async_client.get(reverse("medicines_edit", kwargs={"id": 999}))
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_client_detail_lists_pets(self):
+        owner = await Client.objects.acreate(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+        await Pet.objects.acreate(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1), owner=owner,
+        )
+
+        response = await self.async_client.get(reverse("clients_detail", kwargs={"id": owner.id}))
+
+        self.assertTrue(iscoroutinefunction(resolve(reverse("clients_detail", kwargs={"id": 1})).func))
+        self.assertContains(response, "Firulais")
+
+    async def test_pet_form_searches_owners(self):
+        owner = await Client.objects.acreate(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+        await Client.objects.acreate(
+            name="Martin Palermo", phone="54221555232", city=City.LA_PLATA,
+            email="titan@vetsoft.com",
+        )
+
+        response = await self.async_client.get(reverse("pets_form"), {"owner_search": "veron"})
+
+        self.assertEqual(response.context["owners"], [(str(owner.id), owner.name)])
+
+    async def test_delete_and_bulk_delete(self):
+        providers = [
+            await Provider.objects.acreate(name=f"Proveedor {i}", email="p@vetsoft.com", address="Calle 1")
+            for i in range(3)
+        ]
+
+        await self.async_client.post(reverse("providers_delete"), {"provider_id": providers[0].id})
+        response = await self.async_client.post(
+            reverse("providers_bulk_delete"),
+            {"ids": [providers[1].id, providers[2].id, "9" * 30, "²"]},
+        )
+
+        self.assertRedirects(response, reverse("providers_repo"), fetch_redirect_response=False)
+        self.assertFalse(await Provider.objects.aexists())
+
+    async def test_delete_with_a_malformed_id_is_not_found(self):
+        for data in ({}, {"provider_id": "9" * 30}, {"provider_id": "²"}):
+            response = await self.async_client.post(reverse("providers_delete"), data)
+
+            self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REPLICA_DATABASES=["replica"], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTest(TestCase):
+    """La base de test hace de principal y un archivo SQLite de réplica"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.mkdtemp()
+        connections.settings["replica"] = {
+            **connections.settings["default"],
+            "NAME": os.path.join(cls.directory, "replica.sqlite3"),
+        }
+        with connections["replica"].schema_editor() as editor:
+            editor.create_model(Client)
+            editor.create_model(Pet)
+            editor.create_model(Invoice)
+            editor.create_model(DashboardCounter)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        shutil.rmtree(cls.directory)
+        super().tearDownClass()
+
+    def setUp(self):
+        Client.objects.using("replica").all().delete()
+        Client.objects.using("replica").create(
+            name="Cliente Replica", phone="54221555232", city=City.LA_PLATA,
+            email="replica@vetsoft.com",
+        )
+        Client.objects.create(
+            name="Cliente Principal", phone="54221555232", city=City.LA_PLATA,
+            email="principal@vetsoft.com",
+        )
+
+    def test_repository_reads_from_the_replica(self):
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertContains(response, "Cliente Replica")
+        self.assertNotContains(response, "Cliente Principal")
+
+    def test_export_streams_from_the_replica(self):
+        response = self.client.get(
+            reverse("export", kwargs={"name": "clients", "export_format": "csv"}),
+        )
+
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("Cliente Replica", content)
+
+    def test_writes_go_to_the_primary_and_pin_reads_to_it(self):
+        response = self.client.post(
+            reverse("clients_form"),
+            {
+                "name": "Cliente Nuevo",
+                "phone": "54221555232",
+                "email": "nuevo@vetsoft.com",
+                "city": City.BERISSO,
+            },
+        )
+
+        self.assertIn("db_primary", response.cookies)
+        self.assertTrue(Client.objects.using("default").filter(name="Cliente Nuevo").exists())
+        self.assertFalse(Client.objects.using("replica").filter(name="Cliente Nuevo").exists())
+
+        response = self.client.get(reverse("clients_repo"))
+        self.assertContains(response, "Cliente Nuevo")
+
+    def test_pin_expires_after_the_configured_seconds(self):
+        self.client.post(reverse("clients_delete"), {"client_id": 999})
+
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            response = self.client.get(reverse("clients_repo"))
+
+        self.assertContains(response, "Cliente Replica")
+
+    def test_reads_outside_views_use_the_primary(self):
+        self.assertEqual(Client.objects.get().name, "Cliente Principal")
+        with replica_reads():
+            self.assertEqual(Client.objects.get().name, "Cliente Replica")
+
+
+class RowFragmentCacheTest(TestCase):
+    def setUp(self):
+        caches["fragments"].clear()
+        self.client_obj = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+
+    def test_rows_are_cached_by_their_values(self):
+        self.client.get(reverse("clients_repo"))
+        key = make_template_fragment_key(
+            "client_row",
+            [self.client_obj.pk, self.client_obj.name, self.client_obj.phone,
+             self.client_obj.email, self.client_obj.city],
+        )
+
+        self.assertIn(reverse("clients_edit", kwargs={"id": self.client_obj.id}),
+                      caches["fragments"].get(key))
+
+    def test_edited_row_is_rendered_again(self):
+        self.client.get(reverse("clients_repo"))
+
+        self.client_obj.name = "Martin Palermo"
+        self.client_obj.save()
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertContains(response, "Martin Palermo")
+        self.assertNotContains(response, "Juan Sebastian Veron")
+
+    def test_cached_row_includes_its_delete_button(self):
+        self.client.get(reverse("clients_repo"))
+        key = make_template_fragment_key(
+            "client_row",
+            [self.client_obj.pk, self.client_obj.name, self.client_obj.phone,
+             self.client_obj.email, self.client_obj.city],
+        )
+
+        self.assertIn(f'name="client_id" value="{self.client_obj.id}"',
+                      caches["fragments"].get(key))
+
+    def test_csrf_tokens_do_not_grow_with_the_rows(self):
+        for name in ("Martin Palermo", "Roman Riquelme", "Carlos Tevez"):
+            Client.objects.create(
+                name=name, phone="54221555232", city=City.LA_PLATA,
+                email="jugador@vetsoft.com",
+            )
+        self.client.get(reverse("clients_repo"))
+
+        response = self.client.get(reverse("clients_repo"))
+
+        # Uno para el borrado de seleccionados y otro para el borrado por fila
+        self.assertContains(response, 'name="csrfmiddlewaretoken"', count=2)
+        self.assertContains(response, 'form="clients-delete"', count=4)
+
+
+class StaticAssetsTest(TestCase):
+    """collectstatic con el almacenamiento de producción y WhiteNoise"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        source = os.path.join(directory, "source")
+        os.makedirs(source)
+        with open(os.path.join(source, "site.css"), "w") as css:
+            css.write("body { color: #222; }\n" * 100)
+
+        settings = override_settings(
+            STATIC_ROOT=os.path.join(directory, "root"),
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {
+                    "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+                },
+            },
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.root = os.path.join(directory, "root")
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def hashed_url(self):
+        return static("site.css")
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        url = self.hashed_url()
+        name = os.path.basename(url)
+
+        self.assertRegex(name, r"^site\.[0-9a-f]{12}\.css$")
+        for suffix in ("", ".gz", ".br"):
+            self.assertTrue(os.path.exists(os.path.join(self.root, name + suffix)))
+
+    def test_compressed_variant_is_served_with_far_future_cache(self):
+        response = self.client.get(self.hashed_url(), HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=315360000", response["Cache-Control"])
+        response.close()
+
+
+class VendorStaticTest(TestCase):
+    """Bootstrap y bootstrap-icons versionados en app/static/vendor"""
+
+    def test_committed_files_match_their_pinned_hashes(self):
+        self.assertEqual(vendor_static.mismatched_assets(), [])
+
+        out = StringIO()
+        call_command("vendor_static", stdout=out)
+        self.assertIn(f"{len(vendor_static.VENDOR_ASSETS)} archivos verificados", out.getvalue())
+
+    def test_modified_file_fails_the_verification(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        vendor = os.path.join(directory, "vendor")
+        shutil.copytree(vendor_static.VENDOR_DIR, vendor)
+        with open(os.path.join(vendor, "bootstrap", "bootstrap.min.css"), "a") as css:
+            css.write("body { color: red; }")
+        self.addCleanup(setattr, vendor_static, "VENDOR_DIR", vendor_static.VENDOR_DIR)
+        vendor_static.VENDOR_DIR = Path(vendor)
+
+        with self.assertRaisesMessage(CommandError, "bootstrap/bootstrap.min.css"):
+            call_command("vendor_static", stdout=StringIO())
+
+    def test_base_template_links_the_vendored_files(self):
+        response = self.client.get(reverse("home"))
+
+        for _, name, _ in vendor_static.VENDOR_ASSETS:
+            if name.endswith((".min.css", ".min.js")):
+                self.assertContains(response, static(f"vendor/{name}"))
+
+
+class CompressionTest(TestCase):
+    def setUp(self):
+        for index in range(20):
+            Client.objects.create(
+                name=f"Cliente {index}", phone="54221555232", city=City.LA_PLATA,
+                email=f"cliente{index}@vetsoft.com",
+            )
+
+    def test_brotli_is_preferred_when_accepted(self):
+        response = self.client.get(reverse("clients_repo"), HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn(b"Cliente 19", brotli.decompress(response.content))
+
+    def test_gzip_is_used_without_brotli(self):
+        response = self.client.get(reverse("clients_repo"), HTTP_ACCEPT_ENCODING="gzip, br;q=0")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b"Cliente 19", gzip.decompress(response.content))
+
+    def test_uncompressed_without_accept_encoding(self):
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertContains(response, "Cliente 19")
+
+    def test_streamed_export_is_compressed(self):
+        response = self.client.get(
+            reverse("export", kwargs={"name": "clients", "export_format": "csv"}),
+            HTTP_ACCEPT_ENCODING="br",
+        )
+
+        content = brotli.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Cliente 19", content)
+
+    @override_settings(MINIFY_HTML=True)
+    def test_minified_page_renders_the_same_rows(self):
+        response = self.client.get(reverse("clients_repo"))
+
+        self.assertNotIn(b"\n    ", response.content)
+        self.assertContains(response, "Cliente 19")
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+
+class PetOwnerTest(TestCase):
+    def setUp(self):
+        self.owner = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+
+    def create_pets(self, count):
+        for index in range(count):
+            owner = Client.objects.create(
+                name=f"Dueño {index}", phone="54221555232", city=City.BERISSO,
+                email=f"duenio{index}@vetsoft.com",
+            )
+            Pet.objects.create(
+                name=f"Mascota {index}", breed=Breed.DOG,
+                birthday=datetime.date(2020, 1, 1), owner=owner,
+            )
+
+    def test_pets_repository_shows_the_owner(self):
+        Pet.objects.create(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1),
+            owner=self.owner,
+        )
+
+        response = self.client.get(reverse("pets_repo"))
+
+        self.assertContains(response, "Juan Sebastian Veron")
+        self.assertContains(response, reverse("clients_detail", kwargs={"id": self.owner.id}))
+
+    def test_pets_repository_queries_do_not_grow_with_rows(self):
+        self.create_pets(1)
+        with self.assertNumQueries(1):
+            self.client.get(reverse("pets_repo"))
+
+        self.create_pets(20)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("pets_repo"))
+        self.assertContains(response, "Dueño 19")
+
+    def test_client_detail_lists_its_pets_in_two_queries(self):
+        for name in ("Toby", "Firulais", "Michi"):
+            Pet.objects.create(
+                name=name, breed=Breed.CAT, birthday=datetime.date(2021, 5, 1),
+                owner=self.owner,
+            )
+        self.create_pets(2)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("clients_detail", kwargs={"id": self.owner.id}),
+            )
+
+        self.assertEqual(
+            [pet.name for pet in response.context["pets"]], ["Firulais", "Michi", "Toby"],
+        )
+        self.assertNotContains(response, "Mascota 0")
+
+    def test_client_detail_of_missing_client_returns_404(self):
+        response = self.client.get(reverse("clients_detail", kwargs={"id": 999}))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_can_create_pet_with_owner(self):
+        self.client.post(
+            reverse("pets_form"),
+            data={
+                "name": "Firulais",
+                "breed": Breed.DOG,
+                "birthday": "2024-06-01",
+                "owner": self.owner.id,
+            },
+        )
+
+        self.assertEqual(Pet.objects.get().owner, self.owner)
+
+    def test_cannot_create_pet_with_missing_owner(self):
+        response = self.client.post(
+            reverse("pets_form"),
+            data={
+                "name": "Firulais",
+                "breed": Breed.DOG,
+                "birthday": "2024-06-01",
+                "owner": 999,
+            },
+        )
+
+        self.assertFalse(Pet.objects.exists())
+        self.assertContains(response, "El dueño seleccionado no existe")
+
+    def test_deleting_the_owner_keeps_the_pet(self):
+        pet = Pet.objects.create(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1),
+            owner=self.owner,
+        )
+
+        self.client.post(reverse("clients_delete"), {"client_id": self.owner.id})
+
+        pet.refresh_from_db()
+        self.assertIsNone(pet.owner)
+
+    @override_settings(CACHES=REPOSITORY_CACHE_SETTINGS)
+    def test_renaming_the_owner_refreshes_the_cached_pets_page(self):
+        caches["repository"].clear()
+        Pet.objects.create(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1),
+            owner=self.owner,
+        )
+        self.client.get(reverse("pets_repo"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.name = "Martin Palermo"
+            self.owner.save()
+        response = self.client.get(reverse("pets_repo"))
+
+        self.assertContains(response, "Martin Palermo")
+
+    def test_owner_picker_is_capped_and_searchable(self):
+        self.create_pets(PICKER_LIMIT + 5)
+
+        response = self.client.get(reverse("pets_form"))
+        self.assertEqual(len(response.context["owners"]), PICKER_LIMIT)
+        self.assertNotIn((str(self.owner.id), self.owner.name), response.context["owners"])
+
+        response = self.client.get(
+            reverse("pets_form"), {"name": "Firulais", "owner_search": "veron"},
+        )
+        self.assertEqual(response.context["owners"], [(str(self.owner.id), self.owner.name)])
+        self.assertContains(response, 'value="Firulais"')
+
+    def test_owner_picker_keeps_the_selected_owner(self):
+        self.create_pets(PICKER_LIMIT + 5)
+        pet = Pet.objects.create(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1),
+            owner=self.owner,
+        )
+
+        response = self.client.get(reverse("pets_edit", kwargs={"id": pet.id}))
+
+        self.assertEqual(len(response.context["owners"]), PICKER_LIMIT + 1)
+        self.assertIn((str(self.owner.id), self.owner.name), response.context["owners"])
+
+
+class AppointmentTest(TestCase):
+    def setUp(self):
+        index = scheduling.AvailabilityIndex()
+        self.addCleanup(setattr, scheduling, "availability", scheduling.availability)
+        scheduling.availability = index
+
+        self.vet = Vet.objects.create(
+            name="Carlos Bianchi", phone="221555232", email="virrey@vetsoft.com",
+            speciality="General", opening_time=datetime.time(9),
+            closing_time=datetime.time(12),
+        )
+        self.pet = Pet.objects.create(
+            name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1),
+        )
+        self.day = timezone.localdate() + datetime.timedelta(days=7)
+
+    def book(self, start):
+        return self.client.post(
+            reverse("appointments_form"),
+            {"vet": self.vet.id, "pet": self.pet.id, "start": f"{self.day}T{start}"},
+        )
+
+    def test_pet_picker_searches_by_name_and_shows_the_owner(self):
+        owner = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", city=City.LA_PLATA,
+            email="brujita75@vetsoft.com",
+        )
+        michi = Pet.objects.create(
+            name="Michi", breed=Breed.CAT, birthday=datetime.date(2021, 1, 1), owner=owner,
+        )
+
+        response = self.client.get(reverse("appointments_form"), {"pet_search": "mich"})
+
+        self.assertEqual(response.context["pets"], [(str(michi.id), "Michi", owner.name)])
+        self.assertEqual(len(response.context["vets"]), 1)
+
+    def availability(self):
+        response = self.client.get(
+            reverse("appointments_availability"),
+            {"date_from": self.day, "date_to": self.day},
+        )
+        return [
+            slot.start.strftime("%H:%M")
+            for day in response.context["days"]
+            for vet in day["vets"]
+            for slot in vet["slots"]
+        ]
+
+    def test_can_book_a_free_slot(self):
+        response = self.book("10:00")
+
+        self.assertRedirects(response, reverse("appointments_repo"))
+        appointment = Appointment.objects.get()
+        self.assertEqual(appointment.end - appointment.start, datetime.timedelta(minutes=30))
+        self.assertContains(self.client.get(reverse("appointments_repo")), "Firulais")
+
+    def test_cannot_book_an_overlapping_slot(self):
+        self.book("10:00")
+
+        response = self.book("10:15")
+
+        self.assertContains(response, "El veterinario ya tiene un turno en ese horario")
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_cannot_book_outside_vet_hours(self):
+        response = self.book("11:45")
+
+        self.assertContains(response, "El veterinario no atiende en ese horario")
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_cannot_book_in_the_past(self):
+        self.day = timezone.localdate() - datetime.timedelta(days=1)
+
+        response = self.book("10:00")
+
+        self.assertContains(response, "El turno no puede ser en el pasado")
+
+    def test_malformed_vet_or_start_is_a_form_error(self):
+        response = self.client.post(
+            reverse("appointments_form"),
+            {"vet": "²", "pet": self.pet.id, "start": "9999-12-31T23:50"},
+        )
+
+        self.assertContains(response, "Por favor seleccione un veterinario")
+
+        response = self.client.post(
+            reverse("appointments_form"),
+            {"vet": self.vet.id, "pet": self.pet.id, "start": "9999-12-31T23:50"},
+        )
+
+        self.assertContains(response, "Por favor ingrese una fecha y hora válida")
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_availability_accepts_out_of_range_filters(self):
+        response = self.client.get(
+            reverse("appointments_availability"), {"vet": "²", "date_from": "9999-12-31"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(response.context["date_to"], datetime.date.max)
+
+    def test_availability_skips_booked_slots(self):
+        self.assertEqual(
+            self.availability(), ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"],
+        )
+
+        self.book("10:00")
+
+        self.assertEqual(self.availability(), ["09:00", "09:30", "10:30", "11:00", "11:30"])
+
+    @override_settings(CACHES=REPOSITORY_CACHE_SETTINGS)
+    def test_index_is_updated_incrementally(self):
+        caches["repository"].clear()
+        self.availability()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book("10:00")
+        appointment = Appointment.objects.get()
+
+        with self.assertNumQueries(3):
+            # turnos modificados + cantidad vigente + nombres de los veterinarios
+            self.assertNotIn("10:00", self.availability())
+        with self.assertNumQueries(1):
+            self.availability()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("appointments_delete"), {"appointment_id": appointment.id})
+        with self.assertNumQueries(4):
+            # como falta un turno se leen además los ids vigentes
+            self.assertIn("10:00", self.availability())
+
+    def test_vet_hours_changes_are_picked_up(self):
+        self.availability()
+
+        self.vet.closing_time = datetime.time(10)
+        self.vet.save()
+
+        self.assertEqual(self.availability(), ["09:00", "09:30"])
+
+
+class StockTest(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name="Collar", type="Accesorio", price=10)
+        self.url = reverse("products_stock", args=[self.product.id])
+
+    def test_can_register_stock_movements(self):
+        response = self.client.post(self.url, {"kind": "in", "quantity": "12"})
+        self.assertRedirects(response, self.url)
+        self.client.post(self.url, {"kind": "out", "quantity": "5"})
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, "Disponible: <strong>7</strong>", html=True)
+        self.assertEqual(
+            [(movement.kind.label, movement.quantity) for movement in response.context["movements"]],
+            [("Egreso", -5), ("Ingreso", 12)],
+        )
+
+    def test_cannot_sell_more_than_available(self):
+        Product.move_stock(self.product.id, 3)
+
+        response = self.client.post(self.url, {"kind": "out", "quantity": "4"})
+
+        self.assertContains(response, "No hay stock suficiente")
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 3)
+
+    def test_repositories_show_stock(self):
+        Product.move_stock(self.product.id, 4)
+        medicine = Medicine.objects.create(name="Paracetamoldog", description="Dolor", dose=2)
+        Medicine.move_stock(medicine.id, 9)
+
+        products = self.client.get(reverse("products_repo"))
+        medicines = self.client.get(reverse("medicines_repo"))
+
+        self.assertContains(products, "<td>4</td>", html=True)
+        self.assertContains(products, reverse("products_stock", args=[self.product.id]))
+        self.assertContains(medicines, "<td>9</td>", html=True)
+        self.assertContains(medicines, reverse("medicines_stock", args=[medicine.id]))
+
+    def test_unknown_item_returns_404(self):
+        response = self.client.get(reverse("medicines_stock", args=[999]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class InvoiceTest(TestCase):
+    def setUp(self):
+        self.client_obj = Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+            city=City.LA_PLATA,
+        )
+        self.product = Product.objects.create(name="Collar", type="Accesorio", price=10, stock=3)
+
+    def test_can_register_a_sale(self):
+        response = self.client.post(reverse("invoices_form"), {
+            "client": self.client_obj.id,
+            "product": [self.product.id, ""],
+            "quantity": ["2", ""],
+        })
+
+        self.assertRedirects(response, reverse("invoices_repo"))
+        invoice = Invoice.objects.get()
+        response = self.client.get(reverse("invoices_repo"))
+        self.assertContains(response, "Juan Sebastian Veron")
+        self.assertContains(response, "$20.00")
+
+        response = self.client.get(reverse("invoices_detail", args=[invoice.id]))
+        self.assertContains(response, "<td>Collar</td>", html=True)
+        self.assertContains(response, "$10.00")
+
+    def test_form_keeps_lines_when_the_sale_fails(self):
+        response = self.client.post(reverse("invoices_form"), {
+            "product": [self.product.id],
+            "quantity": ["5"],
+        })
+
+        self.assertContains(response, "No hay stock suficiente de Collar")
+        self.assertEqual(response.context["lines"][0], {"product": str(self.product.id), "quantity": "5"})
+        self.assertEqual(len(response.context["lines"]), 5)
+
+    def test_oversized_quantity_is_reported_in_the_form(self):
+        response = self.client.post(reverse("invoices_form"), {
+            "product": [self.product.id],
+            "quantity": ["9" * 30],
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "La cantidad debe ser un número entero positivo")
+        self.assertFalse(Invoice.objects.exists())
+
+    def test_amounts_that_do_not_fit_the_invoice_are_reported_in_the_form(self):
+        collar = Product.objects.create(name="Collar de oro", type="Accesorio", price=1e12, stock=3)
+        correa = Product.objects.create(name="Correa", type="Accesorio", price=6e9, stock=3)
+
+        response = self.client.post(reverse("invoices_form"), {"product": [collar.id], "quantity": ["1"]})
+        self.assertContains(response, "El importe de Collar de oro supera el máximo de una venta")
+
+        response = self.client.post(reverse("invoices_form"), {"product": [correa.id], "quantity": ["2"]})
+        self.assertContains(response, "El importe de Correa supera el máximo de una venta")
+
+        correa_bis = Product.objects.create(name="Correa doble", type="Accesorio", price=6e9, stock=3)
+        response = self.client.post(reverse("invoices_form"), {
+            "product": [correa.id, correa_bis.id], "quantity": ["1", "1"],
+        })
+        self.assertContains(response, "El total supera el máximo de una venta")
+
+        self.assertFalse(Invoice.objects.exists())
+        self.assertEqual(Product.objects.get(pk=correa.id).stock, 3)
+
+    def test_product_price_is_capped(self):
+        response = self.client.post(
+            reverse("products_form"), {"name": "Collar", "type": "Accesorio", "price": "1e12"},
+        )
+
+        self.assertContains(response, "El precio no puede superar 1000000")
+
+    def test_sales_report_accepts_the_first_date(self):
+        response = self.client.get(reverse("sales_report"), {"date_to": "0001-01-01"})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_product_picker_filters_by_search(self):
+        correa = Product.objects.create(name="Correa", type="Accesorio", price=15, stock=3)
+
+        response = self.client.get(reverse("invoices_form"), {"product_search": "corr"})
+        self.assertEqual([row[0] for row in response.context["products"]], [str(correa.id)])
+
+        response = self.client.get(
+            reverse("invoices_form"), {"product_search": "corr", "product": [self.product.id]},
+        )
+        self.assertEqual(
+            [row[0] for row in response.context["products"]], [str(correa.id), str(self.product.id)],
+        )
+
+    def test_sales_report_reads_daily_totals(self):
+        today = timezone.localdate()
+        DailySales.objects.create(date=today, invoice_count=3, item_count=7, total=150)
+        DailySales.objects.create(
+            date=today - datetime.timedelta(days=1), invoice_count=1, item_count=1, total=25,
+        )
+        DailySales.objects.create(
+            date=today - datetime.timedelta(days=60), invoice_count=9, item_count=9, total=900,
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("sales_report"))
+
+        self.assertEqual(len(response.context["days"]), 2)
+        self.assertEqual(response.context["totals"]["invoice_count"], 4)
+        self.assertEqual(response.context["totals"]["total"], 175)
+
+
+class DashboardTest(TestCase):
+    def test_home_shows_precomputed_stats(self):
+        Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+            city=City.LA_PLATA,
+        )
+        Medicine.objects.create(name="Paracetamoldog", description="Dolor", dose=2, stock=1)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("home"))
+
+        self.assertContains(response, "Clientes: 1")
+        self.assertContains(response, reverse("medicines_stock", args=[Medicine.objects.get().id]))
+        self.assertContains(response, 'data-testid="home-Clientes"')
+
+    def test_rebuild_command_reports_stale_counters(self):
+        Client.objects.create(
+            name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+            city=City.LA_PLATA,
+        )
+        Client.objects.update(city=City.BERISSO)
+        out = StringIO()
+
+        call_command("rebuild_dashboard", stdout=out)
+
+        self.assertIn("2 contadores corregidos", out.getvalue())
+        self.assertContains(self.client.get(reverse("home")), "Clientes: 1")
+
+    def test_non_finite_prices_are_rejected_by_the_product_form(self):
+        for price in ("inf", "-inf", "nan"):
+            response = self.client.post(
+                reverse("products_form"), data={"name": "Collar", "type": "Accesorio", "price": price},
+            )
+
+            self.assertContains(response, "Por favor ingrese un precio")
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(DashboardCounter.objects.filter(group="products_by_price").exists())
+
+    def test_product_with_an_infinite_price_can_be_deleted(self):
+        product = Product.objects.create(name="Collar", type="Accesorio", price=float("inf"))
+        self.assertContains(self.client.get(reverse("home")), "Productos: 1")
+
+        response = self.client.post(reverse("products_delete"), {"product_id": product.id})
+
+        self.assertRedirects(response, reverse("products_repo"))
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(DashboardCounter.objects.filter(group="products_by_price", count__gt=0).exists())
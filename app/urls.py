@@ -4,23 +4,35 @@ from . import views
 
 urlpatterns = [
     path("", view=views.home, name="home"),
+    path("buscar/", view=views.search_view, name="search"),
+    path("exportar/<str:name>.<str:export_format>",
+         view=views.export, name="export"),
+    path("importar/", view=views.import_view, name="import"),
     path("clientes/", view=views.clients_repository, name="clients_repo"),
     path("clientes/nuevo/", view=views.clients_form, name="clients_form"),
+    path("clientes/<int:id>/", view=views.clients_detail, name="clients_detail"),
     path("clientes/editar/<int:id>/",
          view=views.clients_form, name="clients_edit"),
     path("clientes/eliminar/", view=views.clients_delete, name="clients_delete"),
+    path("clientes/eliminar-seleccionados/",
+         view=views.clients_bulk_delete, name="clients_bulk_delete"),
     
     path("productos/", view=views.products_repository, name="products_repo"),
     path("productos/nuevo/", view=views.products_form, name="products_form"),
     path("productos/editar/<int:id>/",
          view=views.products_form, name="products_edit"),
     path("productos/eliminar/", view=views.products_delete, name="products_delete"),
+    path("productos/eliminar-seleccionados/",
+         view=views.products_bulk_delete, name="products_bulk_delete"),
+    path("productos/<int:id>/stock/", view=views.products_stock, name="products_stock"),
 
     # URLS del modelo Vet
     path("veterinario/", view=views.vets_repository, name="vets_repo"),
     path("veterinario/nuevo/", view=views.vets_form, name="vets_form"),
     path("veterinario/editar/<int:id>/", view=views.vets_form, name="vets_edit"),
     path("veterinario/eliminar/", view=views.vets_delete, name="vets_delete"),
+    path("veterinario/eliminar-seleccionados/",
+         view=views.vets_bulk_delete, name="vets_bulk_delete"),
 
     path("proveedores/", view=views.providers_repository, name="providers_repo"),
     path("proveedores/nuevo/", view=views.providers_form, name="providers_form"),
@@ -28,12 +40,17 @@ urlpatterns = [
          view=views.providers_form, name="providers_edit"),
     path("proveedores/eliminar/", view=views.providers_delete,
          name="providers_delete"),
+    path("proveedores/eliminar-seleccionados/",
+         view=views.providers_bulk_delete, name="providers_bulk_delete"),
     path("medicamentos/", view=views.medicines_repository, name="medicines_repo"),
     path("medicamentos/nuevo/", view=views.medicines_form, name="medicines_form"),
     path("medicamentos/editar/<int:id>/",
          view=views.medicines_form, name="medicines_edit"),
     path("medicamentos/eliminar/",
          view=views.medicines_delete, name="medicines_delete"),
+    path("medicamentos/eliminar-seleccionados/",
+         view=views.medicines_bulk_delete, name="medicines_bulk_delete"),
+    path("medicamentos/<int:id>/stock/", view=views.medicines_stock, name="medicines_stock"),
 
     # agregamos las urls de nuestras views para mascotas
     path("mascotas/", view=views.pets_repository, name="pets_repo"),
@@ -42,5 +59,18 @@ urlpatterns = [
          view=views.pets_form, name="pets_edit"),
     # path('pets/form/<int:pet_id>/', views.pets_form, name='pets_edit'),
     path("mascotas/eliminar/", view=views.pets_delete, name="pets_delete"),
+    path("mascotas/eliminar-seleccionados/",
+         view=views.pets_bulk_delete, name="pets_bulk_delete"),
 
+    path("turnos/", view=views.appointments_repository, name="appointments_repo"),
+    path("turnos/nuevo/", view=views.appointments_form, name="appointments_form"),
+    path("turnos/disponibles/",
+         view=views.appointments_availability, name="appointments_availability"),
+    path("turnos/eliminar/",
+         view=views.appointments_delete, name="appointments_delete"),
+
+    path("ventas/", view=views.invoices_repository, name="invoices_repo"),
+    path("ventas/nueva/", view=views.invoices_form, name="invoices_form"),
+    path("ventas/<int:id>/", view=views.invoices_detail, name="invoices_detail"),
+    path("ventas/reporte/", view=views.sales_report, name="sales_report"),
 ]
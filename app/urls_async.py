@@ -0,0 +1,20 @@
+"""
+Rutas de la aplicación con las vistas asíncronas de app/async_views.py.
+
+Tiene las mismas URLs y nombres que app/urls.py: cada vista que tiene versión
+asíncrona se reemplaza por ella y el resto se mantiene. Se activa con
+ASYNC_VIEWS=1 (ver vetsoft/urls.py).
+"""
+
+from django.urls import path
+
+from . import async_views, urls
+
+urlpatterns = [
+    path(
+        str(pattern.pattern),
+        getattr(async_views, pattern.callback.__name__, pattern.callback),
+        name=pattern.name,
+    )
+    for pattern in urls.urlpatterns
+]
@@ -0,0 +1,261 @@
+"""
+Motor de validación declarativo: cada campo es una secuencia de pasos que se
+evalúa en orden y se detiene en el primer error, como las cadenas if/elif de
+los validadores originales.
+
+Al crear el campo, los pasos se encadenan una sola vez en funciones con sus
+datos ya ligados: cada paso es una función `bind(rest)` que retorna el chequeo
+del paso, el cual retorna su mensaje si falla o sigue con `rest` (el chequeo de
+los pasos siguientes, None si es el último).
+"""
+
+import re
+from itertools import compress, count
+
+
+def required(message):
+    """Falla si el valor está vacío"""
+    def bind(rest):
+        if rest is None:
+            # Como último paso alcanza con buscar el valor vacío en un diccionario
+            return {"": message}.get
+
+        def run(v):
+            if v == "":
+                return message
+            return rest(v)
+        return run
+    return bind
+
+
+def not_blank(message):
+    """Falla si el valor está vacío o solo contiene espacios"""
+    def bind(rest):
+        def run(v):
+            if not v.strip():
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def matches(pattern, message):
+    """Falla si el valor no coincide con la expresión regular"""
+    match = re.compile(pattern).match
+
+    def bind(rest):
+        def run(v):
+            if not match(v):
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def starts_with(prefix, message):
+    """Falla si el valor no comienza con el prefijo"""
+    def bind(rest):
+        def run(v):
+            if not v.startswith(prefix):
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def ends_with(suffix, message):
+    """Falla si el valor no termina con el sufijo"""
+    def bind(rest):
+        def run(v):
+            if not v.endswith(suffix):
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def contains(text, message):
+    """Falla si el valor no contiene el texto"""
+    def bind(rest):
+        def run(v):
+            if text not in v:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def digits(message):
+    """Falla si el valor no está formado solo por dígitos"""
+    def bind(rest):
+        def run(v):
+            if not v.isdigit():
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def one_of(options, message):
+    """Falla si el valor no está entre las opciones permitidas"""
+    options = frozenset(options)
+
+    def bind(rest):
+        def run(v):
+            if v not in options:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def none_of(values, message):
+    """Falla si el valor es alguno de los valores indicados"""
+    values = frozenset(values)
+
+    def bind(rest):
+        def run(v):
+            if v in values:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def greater_than(minimum, message):
+    """Falla si el valor no es mayor que el mínimo"""
+    def bind(rest):
+        def run(v):
+            if v <= minimum:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def at_most(maximum, message):
+    """Falla si el valor es mayor que el máximo"""
+    def bind(rest):
+        def run(v):
+            if v > maximum:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def between(minimum, maximum, message):
+    """Falla si el valor está fuera del rango cerrado [minimum, maximum]"""
+    def bind(rest):
+        def run(v):
+            if not minimum <= v <= maximum:
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def convert(function, message):
+    """
+    Reemplaza el valor por function(valor) para los pasos siguientes; falla si
+    la conversión lanza TypeError o ValueError.
+    """
+    def bind(rest):
+        def run(v):
+            try:
+                v = function(v)
+            except (TypeError, ValueError):
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+def check(function, message):
+    """Falla si function(valor) es verdadera (para reglas sin paso específico)"""
+    def bind(rest):
+        def run(v):
+            if function(v):
+                return message
+            return rest and rest(v)
+        return run
+    return bind
+
+
+# Un número con más dígitos no entra en un entero de 64 bits (las columnas de SQLite)
+MAX_DIGITS = 18
+
+
+def parse_digits(value):
+    """
+    Convierte a entero un texto formado solo por dígitos ASCII (ids y cantidades
+    de los formularios); retorna None si no lo es o si no entra en la base.
+    """
+    if value.isascii() and value.isdigit() and len(value) <= MAX_DIGITS:
+        return int(value)
+    return None
+
+
+class Field:
+    """Reglas de un campo: clave de entrada, clave de error y pasos de validación"""
+
+    def __init__(self, name, *steps, error_key=None):
+        self.name = name
+        self.error_key = error_key or name
+
+        # error(value) retorna el mensaje del primer paso que falla, o None si
+        # el valor es válido
+        error = None
+        for bind in reversed(steps):
+            error = bind(error)
+        self.error = error or _valid
+
+
+def _valid(value):
+    return None
+
+
+class Schema:
+    """
+    Conjunto de campos que se validan juntos.
+
+    - validate(data): valida una fila y retorna {campo: mensaje de error}.
+    - validate_batch(rows): valida varias filas de una vez y retorna los errores
+      por columna, {campo: {índice de fila: mensaje}}, omitiendo las columnas
+      sin errores.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self._checks = tuple((field.name, field.error_key, field.error) for field in fields)
+
+    def validate(self, data):
+        """Valida una fila y retorna los errores por campo"""
+        errors = {}
+        get = data.get
+        for name, key, error in self._checks:
+            message = error(get(name, ""))
+            if message is not None:
+                errors[key] = message
+        return errors
+
+    def validate_batch(self, rows):
+        """
+        Valida varias filas y retorna los errores por columna y fila.
+
+        Cada valor distinto de una columna se valida una sola vez (en una
+        importación se repiten ciudades, tipos y precios); el resto de la
+        columna se resuelve buscando los valores inválidos en un diccionario.
+        """
+        errors = {}
+        for name, key, error in self._checks:
+            values = [row.get(name, "") for row in rows]
+            invalid = {}
+            for value in set(values):
+                message = error(value)
+                if message is not None:
+                    invalid[value] = message
+            if invalid:
+                failed = compress(count(), map(invalid.__contains__, values))
+                errors[key] = {index: invalid[values[index]] for index in failed}
+        return errors
@@ -1,19 +1,186 @@
+import codecs
+import datetime
+from itertools import groupby
+
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Prefetch, Sum
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render, reverse
-
-from .models import Breed, City, Client, Medicine, Pet, Product, Provider, Vet
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from . import dashboard
+from .cache import cached_paginate, conditional_page
+from .exports import EXPORT_FORMATS, EXPORTS, iter_export
+from .filters import (
+    CLIENT_FILTERS,
+    MEDICINE_FILTERS,
+    PET_FILTERS,
+    PRODUCT_FILTERS,
+    VET_FILTERS,
+)
+from .imports import IMPORTS, import_csv
+from .models import (
+    MAX_STOCK_MOVEMENT,
+    Appointment,
+    Breed,
+    City,
+    Client,
+    DailySales,
+    Invoice,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    StockKind,
+    Vet,
+)
+from .pickers import picker_choices
+from .scheduling import find_free_slots
+from .search import search
+from .validation import parse_digits
 
 
 def home(request):
-    """Renderiza la página de inicio."""
-    return render(request, "home.html")
+    """Renderiza la página de inicio con las estadísticas precalculadas."""
+    return render(request, "home.html", {"stats": dashboard.summary()})
 
 
-def clients_repository(request):
-    """Renderiza la página con la lista de clientes."""
-    clients = Client.objects.all()
-    return render(request, "clients/repository.html", {"clients": clients})
+def search_view(request):
+    """Renderiza los resultados de la búsqueda de texto completo ordenados por relevancia."""
+    query = request.GET.get("q", "").strip()
+    results = search(query) if query else []
+    return render(request, "search.html", {"query": query, "results": results})
+
+
+def export(request, name, export_format):
+    """Descarga todas las filas de un modelo en CSV o NDJSON sin cargarlas en memoria."""
+    if name not in EXPORTS or export_format not in EXPORT_FORMATS:
+        raise Http404("Export inexistente")
+
+    response = StreamingHttpResponse(
+        iter_export(name, export_format),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.{export_format}"'
+    return response
+
+
+def delete_by_ids(model, ids, missing_404=False):
+    """Elimina con un único DELETE filtrado las filas con los ids indicados."""
+    with transaction.atomic():
+        _, deleted = model.objects.filter(pk__in=ids).delete()
+
+    count = deleted.get(model._meta.label, 0)
+    if missing_404 and count == 0:
+        raise Http404("No existe el registro a eliminar")
+    return count
+
+
+def posted_id(request, name):
+    """Retorna el id enviado en el campo `name` del formulario; 404 si falta o no es un id."""
+    pk = parse_digits(request.POST.get(name, ""))
+    if pk is None:
+        raise Http404("No existe el registro a eliminar")
+    return pk
+
+
+def bulk_delete(request, model, label, repository):
+    """Elimina los ids enviados en el formulario e informa cuántos se eliminaron."""
+    # Los valores que no son ids (o no entran en la columna) se descartan
+    ids = [pk for pk in map(parse_digits, request.POST.getlist("ids")) if pk is not None]
+    count = delete_by_ids(model, ids) if ids else 0
+    messages.success(request, f"Se eliminaron {count} {label}")
+
+    return redirect(reverse(repository))
+
+
+# Movimientos que se muestran en la página de stock de un artículo
+STOCK_MOVEMENTS_SHOWN = 20
+
 
+def stock_page(request, model, id, repository):
+    """Muestra el stock de un artículo con sus últimos movimientos y registra uno nuevo."""
+    item = get_object_or_404(model, pk=id)
+    errors = {}
 
+    if request.method == "POST":
+        saved, errors = model.save_stock_movement(item.pk, request.POST)
+        if saved:
+            return redirect(request.path)
+
+    return render(
+        request, "stock/detail.html", {
+            "item": item,
+            "movements": item.movements.order_by("-created_at", "-pk")[:STOCK_MOVEMENTS_SHOWN],
+            "kinds": StockKind.choices,
+            "max_quantity": MAX_STOCK_MOVEMENT,
+            "movement": request.POST,
+            "errors": errors,
+            "repository": repository,
+        },
+    )
+
+
+def import_view(request):
+    """Renderiza y procesa el formulario de importación masiva desde CSV."""
+    context = {"models": sorted(IMPORTS)}
+    if request.method == "POST":
+        name = request.POST.get("model", "")
+        upload = request.FILES.get("file")
+        errors = {}
+
+        if name not in IMPORTS:
+            errors["model"] = "Por favor seleccione un modelo"
+        if upload is None:
+            errors["file"] = "Por favor seleccione un archivo CSV"
+
+        if errors:
+            context.update({"errors": errors, "selected": name})
+            return render(request, "imports/form.html", context)
+
+        lines = codecs.iterdecode(upload, "utf-8-sig")
+        try:
+            context.update({"report": import_csv(name, lines), "selected": name})
+        except UnicodeDecodeError:
+            # Las líneas anteriores al error ya se importaron en sus lotes
+            errors["file"] = "El archivo debe estar codificado en UTF-8"
+            context.update({"errors": errors, "selected": name})
+
+    return render(request, "imports/form.html", context)
+
+
+@conditional_page(Client)
+def clients_repository(request):
+    """Renderiza la página con la lista de clientes."""
+    filters = CLIENT_FILTERS.apply(Client.objects.all(), request.GET)
+    page = cached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "clients/repository.html",
+        {
+            "clients": page.object_list,
+            "page": page,
+            "filters": filters,
+            "cities": City.choices,
+        },
+    )
+
+
+@conditional_page(Client, Pet)
+def clients_detail(request, id):
+    """Renderiza la ficha de un cliente con la lista de sus mascotas."""
+    client = get_object_or_404(
+        Client.objects.prefetch_related(
+            Prefetch("pets", queryset=Pet.objects.order_by("name")),
+        ),
+        pk=id,
+    )
+    return render(request, "clients/detail.html", {"client": client, "pets": client.pets.all()})
+
+
+@conditional_page(Client)
 def clients_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar clientes."""
     city = City.choices
@@ -47,19 +214,42 @@ def clients_form(request, id=None):
 
 def clients_delete(request):
     """Elimina un cliente y redirige al repositorio de clientes."""
-    client_id = request.POST.get("client_id")
-    client = get_object_or_404(Client, pk=int(client_id))
-    client.delete()
+    delete_by_ids(Client, [posted_id(request, "client_id")], missing_404=True)
 
     return redirect(reverse("clients_repo"))
 
 
-def pets_repository(request):
-    """Renderiza la página con la lista de mascotas."""
-    pets = Pet.objects.all()
-    return render(request, "pets/repository.html", {"pets": pets})
+@require_POST
+def clients_bulk_delete(request):
+    """Elimina los clientes seleccionados y redirige al repositorio."""
+    return bulk_delete(request, Client, "clientes", "clients_repo")
 
 
+def owner_choices(query="", selected=()):
+    """Retorna los clientes que coinciden con la búsqueda como opciones (id, nombre)."""
+    return picker_choices(Client.objects.all(), ("name",), query, selected, search_kind="client")
+
+
+@conditional_page(Pet, Client)
+def pets_repository(request):
+    """Renderiza la página con la lista de mascotas y sus dueños."""
+    filters = PET_FILTERS.apply(Pet.objects.select_related("owner"), request.GET)
+    page = cached_paginate(
+        request, filters.queryset, key=filters.sort, depends_on=(Client,),
+    )
+    return render(
+        request,
+        "pets/repository.html",
+        {
+            "pets": page.object_list,
+            "page": page,
+            "filters": filters,
+            "breeds": Breed.choices,
+        },
+    )
+
+
+@conditional_page(Pet, Client)
 def pets_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar mascotas."""
     breed = Breed.choices
@@ -77,37 +267,60 @@ def pets_form(request, id=None):
         if saved:
             return redirect(reverse("pets_repo"))
 
+        owner = request.POST.get("owner", "")
         return render(
             request, "pets/form.html", {"errors": errors,
                                         "pet": request.POST,
-                                        "breeds": breed},
+                                        "breeds": breed,
+                                        "owners": owner_choices(
+                                            request.POST.get("owner_search", ""), [owner]),
+                                        "owner": owner},
         )
 
-    pet = None
-    if id is not None:
+    # Al buscar un dueño se conservan los datos ya cargados en el formulario
+    pet = request.GET if "owner_search" in request.GET else None
+    owner = request.GET.get("owner", "")
+    if id is not None and pet is None:
         pet = get_object_or_404(Pet, pk=id)
+        owner = str(pet.owner_id or "")
 
-    return render(request, "pets/form.html", {"pet": pet, "breeds": breed})
+    owners = owner_choices(request.GET.get("owner_search", ""), [owner])
+    return render(
+        request,
+        "pets/form.html",
+        {"pet": pet, "breeds": breed, "owners": owners, "owner": owner},
+    )
 
 
 def pets_delete(request):
     """Elimina una mascota y redirige al repositorio de mascotas."""
-    pet_id = request.POST.get("pet_id")
-    pet = get_object_or_404(Pet, pk=int(pet_id))
-    pet.delete()
+    delete_by_ids(Pet, [posted_id(request, "pet_id")], missing_404=True)
 
     return redirect(reverse("pets_repo"))
 
 
+@require_POST
+def pets_bulk_delete(request):
+    """Elimina las mascotas seleccionadas y redirige al repositorio."""
+    return bulk_delete(request, Pet, "mascotas", "pets_repo")
+
+
 # Vista para mostrar todos los medicamentos en el repositorio
+@conditional_page(Medicine)
 def medicines_repository(request):
     """Renderiza la página con la lista de medicamentos."""
-    medicines = Medicine.objects.all()
-    return render(request, "medicines/repository.html", {"medicines": medicines})
+    filters = MEDICINE_FILTERS.apply(Medicine.objects.all(), request.GET)
+    page = cached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "medicines/repository.html",
+        {"medicines": page.object_list, "page": page, "filters": filters},
+    )
 
 # Vista para el formulario de creación/edición de medicamentos
 
 
+@conditional_page(Medicine)
 def medicines_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar medicamentos."""
     if request.method == "POST":
@@ -146,20 +359,35 @@ def medicines_form(request, id=None):
 
 def medicines_delete(request):
     """Elimina un medicamento y redirige al repositorio de medicamentos."""
-    medicine_id = request.POST.get("medicine_id")
-    medicine = get_object_or_404(Medicine, pk=int(medicine_id))
-    medicine.delete()
+    delete_by_ids(Medicine, [posted_id(request, "medicine_id")], missing_404=True)
 
     # Redirige a la página del repositorio de medicamentos
     return redirect(reverse("medicines_repo"))
 
 
+@require_POST
+def medicines_bulk_delete(request):
+    """Elimina los medicamentos seleccionados y redirige al repositorio."""
+    return bulk_delete(request, Medicine, "medicamentos", "medicines_repo")
+
+
+def medicines_stock(request, id):
+    """Renderiza el stock de un medicamento y registra ingresos y egresos."""
+    return stock_page(request, Medicine, id, "medicines_repo")
+
+
+@conditional_page(Provider)
 def providers_repository(request):
     """Renderiza la página con la lista de proveedores."""
-    providers = Provider.objects.all()
-    return render(request, "providers/repository.html", {"providers": providers})
+    page = cached_paginate(request, Provider.objects.all())
+    return render(
+        request,
+        "providers/repository.html",
+        {"providers": page.object_list, "page": page},
+    )
 
 
+@conditional_page(Provider)
 def providers_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar proveedores."""
     if request.method == "POST":
@@ -190,19 +418,30 @@ def providers_form(request, id=None):
 
 def providers_delete(request):
     """Elimina un proveedor y redirige al repositorio de proveedores."""
-    provider_id = request.POST.get("provider_id")
-    provider = get_object_or_404(Provider, pk=int(provider_id))
-    provider.delete()
+    delete_by_ids(Provider, [posted_id(request, "provider_id")], missing_404=True)
 
     return redirect(reverse("providers_repo"))
 
 
+@require_POST
+def providers_bulk_delete(request):
+    """Elimina los proveedores seleccionados y redirige al repositorio."""
+    return bulk_delete(request, Provider, "proveedores", "providers_repo")
+
+
+@conditional_page(Product)
 def products_repository(request):
     """Renderiza la página con la lista de productos."""
-    products = Product.objects.all()
-    return render(request, "products/repository.html", {"products": products})
+    filters = PRODUCT_FILTERS.apply(Product.objects.all(), request.GET)
+    page = cached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "products/repository.html",
+        {"products": page.object_list, "page": page, "filters": filters},
+    )
 
 
+@conditional_page(Product)
 def products_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar productos."""
     if request.method == "POST":
@@ -233,20 +472,36 @@ def products_form(request, id=None):
 
 def products_delete(request):
     """Elimina un producto y redirige al repositorio de productos."""
-    product_id = request.POST.get("product_id")
-    product = get_object_or_404(Product, pk=int(product_id))
-    product.delete()
+    delete_by_ids(Product, [posted_id(request, "product_id")], missing_404=True)
 
     return redirect(reverse("products_repo"))
 
 
+@require_POST
+def products_bulk_delete(request):
+    """Elimina los productos seleccionados y redirige al repositorio."""
+    return bulk_delete(request, Product, "productos", "products_repo")
+
+
+def products_stock(request, id):
+    """Renderiza el stock de un producto y registra ingresos y egresos."""
+    return stock_page(request, Product, id, "products_repo")
+
+
 # Funciones de Vet
+@conditional_page(Vet)
 def vets_repository(request):
     """Renderiza la página con la lista de veterinarios."""
-    vets = Vet.objects.all()
-    return render(request, "vets/repository.html", {"vets": vets})
+    filters = VET_FILTERS.apply(Vet.objects.all(), request.GET)
+    page = cached_paginate(request, filters.queryset, key=filters.sort)
+    return render(
+        request,
+        "vets/repository.html",
+        {"vets": page.object_list, "page": page, "filters": filters},
+    )
 
 
+@conditional_page(Vet)
 def vets_form(request, id=None):
     """Renderiza y maneja el formulario para crear o editar veterinarios."""
     if request.method == "POST":
@@ -277,8 +532,214 @@ def vets_form(request, id=None):
 
 def vets_delete(request):
     """Elimina un veterinario y redirige al repositorio de veterinarios."""
-    vet_id = request.POST.get("vet_id")
-    vet = get_object_or_404(Vet, pk=int(vet_id))
-    vet.delete()
+    delete_by_ids(Vet, [posted_id(request, "vet_id")], missing_404=True)
 
     return redirect(reverse("vets_repo"))
+
+
+@require_POST
+def vets_bulk_delete(request):
+    """Elimina los veterinarios seleccionados y redirige al repositorio."""
+    return bulk_delete(request, Vet, "veterinarios", "vets_repo")
+
+
+# Cantidad máxima de días que abarca una búsqueda de turnos libres
+AVAILABILITY_MAX_DAYS = 31
+
+# Última fecha desde la que se buscan turnos libres, para que el rango no pase de date.max
+AVAILABILITY_LAST_DATE = datetime.date.max - datetime.timedelta(days=AVAILABILITY_MAX_DAYS)
+
+
+@conditional_page(Appointment, Vet, Pet)
+def appointments_repository(request):
+    """Renderiza la página con los próximos turnos."""
+    queryset = Appointment.objects.select_related("vet", "pet").filter(
+        end__gte=timezone.now(),
+    )
+    page = cached_paginate(request, queryset, key="start", depends_on=(Vet, Pet))
+    return render(
+        request,
+        "appointments/repository.html",
+        {"appointments": page.object_list, "page": page},
+    )
+
+
+def _appointment_choices(appointment):
+    return {
+        "vets": picker_choices(
+            Vet.objects.all(), ("name",),
+            appointment.get("vet_search", ""), [appointment.get("vet", "")],
+        ),
+        "pets": picker_choices(
+            Pet.objects.all(), ("name", "owner__name"),
+            appointment.get("pet_search", ""), [appointment.get("pet", "")],
+        ),
+    }
+
+
+def appointments_form(request):
+    """Renderiza y maneja el formulario para reservar un turno."""
+    if request.method == "POST":
+        saved, errors = Appointment.save_appointment(request.POST)
+
+        if saved:
+            return redirect(reverse("appointments_repo"))
+
+        return render(
+            request, "appointments/form.html", {
+                "errors": errors,
+                "appointment": request.POST,
+                **_appointment_choices(request.POST),
+            },
+        )
+
+    return render(
+        request, "appointments/form.html", {
+            "appointment": request.GET,
+            **_appointment_choices(request.GET),
+        },
+    )
+
+
+def appointments_delete(request):
+    """Cancela un turno y redirige a la lista de turnos."""
+    delete_by_ids(Appointment, [posted_id(request, "appointment_id")], missing_404=True)
+
+    return redirect(reverse("appointments_repo"))
+
+
+def _parse_date(value, default):
+    try:
+        return datetime.date.fromisoformat(value) if value else default
+    except ValueError:
+        return default
+
+
+def appointments_availability(request):
+    """Renderiza los turnos libres de los veterinarios en un rango de fechas."""
+    today = timezone.localdate()
+    date_from = max(_parse_date(request.GET.get("date_from"), today), today)
+    date_from = min(date_from, AVAILABILITY_LAST_DATE)
+    date_to = _parse_date(request.GET.get("date_to"), date_from + datetime.timedelta(days=6))
+    date_to = min(date_to, date_from + datetime.timedelta(days=AVAILABILITY_MAX_DAYS - 1))
+
+    vet = request.GET.get("vet", "")
+    vet_id = parse_digits(vet)
+    vet_ids = None if vet_id is None else [vet_id]
+    slots = find_free_slots(date_from, date_to, vet_ids=vet_ids)
+
+    vets = dict(Vet.objects.order_by("name").values_list("pk", "name"))
+    days = [
+        {
+            "date": date,
+            "vets": [
+                {"id": vet_id, "name": vets.get(vet_id, ""), "slots": list(vet_slots)}
+                for vet_id, vet_slots in groupby(day_slots, key=lambda slot: slot.vet_id)
+            ],
+        }
+        for date, day_slots in groupby(
+            slots, key=lambda slot: timezone.localtime(slot.start).date(),
+        )
+    ]
+
+    return render(
+        request,
+        "appointments/availability.html",
+        {
+            "days": days,
+            "date_from": date_from,
+            "date_to": date_to,
+            "vet": vet,
+            "vets": [(str(pk), name) for pk, name in vets.items()],
+        },
+    )
+
+
+# Líneas vacías que ofrece el formulario de venta
+INVOICE_FORM_LINES = 5
+
+# Días que muestra el reporte de ventas si no se indica el rango
+SALES_REPORT_DAYS = 30
+
+# Primera fecha hasta la que se puede pedir el reporte, para que el rango por
+# defecto no empiece antes de date.min
+SALES_REPORT_FIRST_DATE = datetime.date.min + datetime.timedelta(days=SALES_REPORT_DAYS - 1)
+
+
+@conditional_page(Invoice, Client)
+def invoices_repository(request):
+    """Renderiza la página con la lista de ventas."""
+    page = cached_paginate(
+        request, Invoice.objects.select_related("client"), depends_on=(Client,),
+    )
+    return render(
+        request,
+        "invoices/repository.html",
+        {"invoices": page.object_list, "page": page},
+    )
+
+
+def invoices_detail(request, id):
+    """Renderiza una venta con sus líneas."""
+    invoice = get_object_or_404(Invoice.objects.select_related("client"), pk=id)
+    return render(
+        request,
+        "invoices/detail.html",
+        {"invoice": invoice, "lines": invoice.lines.order_by("pk")},
+    )
+
+
+def invoices_form(request):
+    """Renderiza y maneja el formulario para registrar una venta."""
+    errors = {}
+    invoice = request.GET
+    if request.method == "POST":
+        saved, errors = Invoice.save_invoice(request.POST)
+
+        if saved:
+            return redirect(reverse("invoices_repo"))
+
+        invoice = request.POST
+
+    # Las líneas enviadas (para no perderlas si hubo errores) y las vacías restantes
+    lines = [
+        {"product": product, "quantity": quantity}
+        for product, quantity in zip(invoice.getlist("product"), invoice.getlist("quantity"))
+    ]
+    lines += [{}] * max(INVOICE_FORM_LINES - len(lines), 0)
+
+    return render(
+        request, "invoices/form.html", {
+            "errors": errors,
+            "invoice": invoice,
+            "lines": lines,
+            "clients": owner_choices(invoice.get("client_search", ""), [invoice.get("client", "")]),
+            "products": picker_choices(
+                Product.objects.all(), ("name", "price", "stock"),
+                invoice.get("product_search", ""), invoice.getlist("product"),
+                search_kind="product",
+            ),
+        },
+    )
+
+
+@conditional_page(Invoice)
+def sales_report(request):
+    """Renderiza los totales de ventas por día de un rango de fechas."""
+    today = timezone.localdate()
+    date_to = _parse_date(request.GET.get("date_to"), today)
+    date_to = max(date_to, SALES_REPORT_FIRST_DATE)
+    date_from = _parse_date(
+        request.GET.get("date_from"), date_to - datetime.timedelta(days=SALES_REPORT_DAYS - 1),
+    )
+
+    days = DailySales.objects.filter(date__range=(date_from, date_to)).order_by("-date")
+    totals = days.aggregate(
+        invoice_count=Sum("invoice_count"), item_count=Sum("item_count"), total=Sum("total"),
+    )
+
+    return render(
+        request,
+        "invoices/report.html",
+        {"days": days, "totals": totals, "date_from": date_from, "date_to": date_to},
+    )
@@ -0,0 +1,19 @@
+import os
+
+import django
+
+
+def setup():
+    """Configura Django para ejecutar un benchmark como script independiente"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vetsoft.settings")
+    django.setup()
+
+
+def client_name(index):
+    """Nombre válido (solo letras) y distinto para cada índice"""
+    letters = ""
+    while True:
+        index, rest = divmod(index, 26)
+        letters += chr(ord("a") + rest)
+        if not index:
+            return f"Cliente {letters}"
@@ -0,0 +1,86 @@
+"""
+Mide tamaño y latencia del listado de clientes con compresión y minificación.
+
+Carga 10.000 clientes en una base SQLite temporal y pide el listado completo
+en una sola página con cada combinación de Accept-Encoding (sin comprimir,
+gzip, brotli) y MINIFY_HTML, a través de toda la pila de middleware. Además de
+la latencia en el servidor se estima el tiempo total con un enlace de 20 Mbit/s.
+
+Uso: python -m benchmarks.compression [clientes] [peticiones por variante]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+DIRECTORY = tempfile.mkdtemp()
+os.environ["SQLITE_PATH"] = os.path.join(DIRECTORY, "db.sqlite3")
+os.environ["REPOSITORY_CACHE_BACKEND"] = "dummy"
+os.environ["STATIC_ROOT"] = DIRECTORY
+
+from benchmarks import client_name, setup  # noqa: E402
+
+setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.test import Client as HttpClient  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from app.imports import import_rows  # noqa: E402
+
+# Enlace con el que se estima el tiempo total (servidor + descarga)
+LINK_MBPS = 20
+
+ENCODINGS = (("sin comprimir", ""), ("gzip", "gzip"), ("brotli", "gzip, br"))
+
+
+def measure(encoding, minify, requests):
+    """Retorna los bytes enviados y la mediana de latencia de una variante"""
+    with override_settings(MINIFY_HTML=minify):
+        client = HttpClient(HTTP_HOST="localhost", HTTP_ACCEPT_ENCODING=encoding)
+        url = reverse("clients_repo")
+        size = len(client.get(url).content)
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url)
+            latencies.append(time.perf_counter() - start)
+    return size, statistics.median(latencies) * 1000
+
+
+def main():
+    """Ejecuta el benchmark e imprime bytes y latencia de cada variante"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    try:
+        call_command("migrate", verbosity=0)
+        import_rows("clients", (
+            {"name": client_name(i), "phone": "54221555232",
+             "email": f"c{i}@vetsoft.com", "city": "La Plata"}
+            for i in range(count)
+        ))
+
+        print(f"{count} clientes en una página, mediana de {requests} peticiones")
+        baseline = None
+        with override_settings(REPOSITORY_PAGE_SIZE=count):
+            for minify in (False, True):
+                for name, encoding in ENCODINGS:
+                    size, latency = measure(encoding, minify, requests)
+                    baseline = baseline or size
+                    label = f"{name}{' + minificado' if minify else ''}"
+                    transfer = size * 8 / (LINK_MBPS * 1e6) * 1000
+                    print(
+                        f"{label:26} {size / 1024:9.1f} KiB  {size / baseline:6.1%}  "
+                        f"servidor {latency:7.1f} ms  total {latency + transfer:7.1f} ms",
+                    )
+    finally:
+        shutil.rmtree(DIRECTORY)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compara las estadísticas de inicio precalculadas con la agregación en vivo.
+
+Carga clientes, mascotas y productos (un millón de cada uno por defecto) en una
+base SQLite temporal y mide:
+
+- la agregación en vivo: GROUP BY por ciudad, raza y especialidad y un
+  OFFSET sobre el índice de precios por cada percentil,
+- dashboard.summary(), que lee los contadores,
+- el costo extra de cada escritura (alta, cambio y baja de un cliente) por
+  mantener los contadores con señales,
+- dashboard.rebuild(), la reconstrucción periódica.
+
+Uso: python -m benchmarks.dashboard [filas por tabla] [repeticiones]
+"""
+
+import datetime
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+DIRECTORY = tempfile.mkdtemp()
+os.environ["SQLITE_PATH"] = os.path.join(DIRECTORY, "db.sqlite3")
+os.environ["REPOSITORY_CACHE_BACKEND"] = "dummy"
+
+from benchmarks import setup  # noqa: E402
+
+setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.db.models.signals import post_delete, post_save  # noqa: E402
+
+from app import dashboard  # noqa: E402
+from app.models import Breed, City, Client, Medicine, Pet, Product, Vet  # noqa: E402
+from app.search import drop_search_index  # noqa: E402
+
+SPECIALITIES = ("General", "Cirugía", "Dermatología", "Cardiología")
+
+
+def seed(rows):
+    """Inserta las filas con SQL directo (sin señales) y reconstruye los contadores"""
+    # Los triggers de búsqueda multiplicarían el tiempo de carga
+    drop_search_index(connection)
+    random.seed(1)
+    cities, breeds = City.values, Breed.values
+    tables = {
+        "app_client": (
+            ("name", "phone", "email", "city"),
+            lambda i: ("Cliente", 54221555232, f"c{i}@vetsoft.com", random.choice(cities)),
+        ),
+        "app_pet": (
+            ("name", "breed", "birthday"),
+            lambda i: ("Mascota", random.choice(breeds), datetime.date(2020, 1, 1)),
+        ),
+        "app_product": (
+            ("name", "type", "price", "stock"),
+            lambda i: ("Producto", "Accesorio", round(random.lognormvariate(4, 1), 2), 10),
+        ),
+        "app_vet": (
+            ("name", "phone", "email", "address", "speciality", "opening_time", "closing_time"),
+            lambda i: ("Vet", "221555232", f"v{i}@vetsoft.com", "", random.choice(SPECIALITIES),
+                       "09:00:00", "18:00:00"),
+        ),
+    }
+    with connection.cursor() as cursor:
+        for table, (columns, row) in tables.items():
+            count = rows if table != "app_vet" else max(rows // 1000, 1)
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))})",
+                (row(i) for i in range(count)),
+            )
+    Medicine.objects.bulk_create(
+        Medicine(name=f"Medicamento {i}", description="-", dose=1, stock=i)
+        for i in range(1000)
+    )
+    connection.cursor().execute("ANALYZE")
+    dashboard.rebuild()
+
+
+def live_summary():
+    """Calcula las mismas estadísticas agrupando las tablas en cada llamada"""
+    products = Product.objects.count()
+    prices = Product.objects.order_by("price").values_list("price", flat=True)
+    return {
+        "clients_by_city": list(Client.objects.values("city").annotate(n=Count("pk"))),
+        "pets_by_breed": list(Pet.objects.values("breed").annotate(n=Count("pk"))),
+        "vets_by_speciality": list(Vet.objects.values("speciality").annotate(n=Count("pk"))),
+        "price_percentiles": [
+            prices[max(products * percentile // 100 - 1, 0)]
+            for percentile in dashboard.PRICE_PERCENTILES
+        ] if products else [],
+        "low_stock": list(
+            Medicine.objects.filter(stock__lte=dashboard.LOW_STOCK)
+            .order_by("stock", "name")
+            .values_list("pk", "name", "stock")[:dashboard.LOW_STOCK_SHOWN],
+        ),
+    }
+
+
+def measure(function, repetitions):
+    """Retorna la mediana en milisegundos de varias llamadas"""
+    latencies = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def client_writes():
+    """Alta, cambio de ciudad y baja de un cliente, como lo hacen los formularios"""
+    Client.save_client({
+        "name": "Cliente", "phone": "54221555232", "email": "nuevo@vetsoft.com", "city": "Berisso",
+    })
+    client = Client.objects.order_by("-pk").first()
+    client.update_client({
+        "name": "Cliente", "phone": "54221555232", "email": "nuevo@vetsoft.com", "city": "Ensenada",
+    })
+    client.delete()
+
+
+def main():
+    """Ejecuta el benchmark e imprime la latencia de cada variante"""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    try:
+        call_command("migrate", verbosity=0)
+        start = time.perf_counter()
+        seed(rows)
+        print(f"{rows} clientes, mascotas y productos (carga {time.perf_counter() - start:.0f} s), "
+              f"mediana de {repetitions} repeticiones")
+
+        live = measure(live_summary, repetitions)
+        counters = measure(dashboard.summary, repetitions)
+        print(f"{'agregación en vivo':30} {live:9.1f} ms")
+        print(f"{'contadores':30} {counters:9.1f} ms  x{live / counters:.0f}")
+
+        with_signals = measure(client_writes, repetitions * 4)
+        post_save.disconnect(dashboard.record_saved, sender=Client)
+        post_delete.disconnect(dashboard.record_deleted, sender=Client)
+        without_signals = measure(client_writes, repetitions * 4)
+        print(f"{'escrituras sin contadores':30} {without_signals:9.1f} ms")
+        print(f"{'escrituras con contadores':30} {with_signals:9.1f} ms  "
+              f"(+{with_signals - without_signals:.1f} ms)")
+
+        print(f"{'rebuild()':30} {measure(dashboard.rebuild, 1):9.1f} ms")
+    finally:
+        shutil.rmtree(DIRECTORY)
+
+
+if __name__ == "__main__":
+    main()
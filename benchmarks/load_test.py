@@ -0,0 +1,154 @@
+"""
+Prueba de carga: compara runserver con gunicorn (WSGI y ASGI).
+
+Cada servidor se levanta contra una base SQLite temporal con datos de prueba y
+recibe peticiones concurrentes a la página de inicio y a los listados durante
+un tiempo fijo; se informan peticiones por segundo y latencias.
+
+Uso: python -m benchmarks.load_test [segundos] [conexiones concurrentes]
+"""
+
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PORT = 8765
+
+PATHS = ("/", "/clientes/", "/productos/", "/medicamentos/", "/veterinario/")
+
+SEED_ROWS = 500
+
+SERVERS = {
+    "runserver": [
+        sys.executable, "manage.py", "runserver", f"127.0.0.1:{PORT}", "--noreload",
+    ],
+    "gunicorn wsgi": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+    "gunicorn asgi": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+}
+
+
+def _environment(directory, name):
+    env = {
+        **os.environ,
+        "SQLITE_PATH": os.path.join(directory, "db.sqlite3"),
+        "REPOSITORY_CACHE_LOCATION": os.path.join(directory, "cache"),
+        "PORT": str(PORT),
+        "GUNICORN_MAX_REQUESTS": "0",
+    }
+    env.setdefault("WEB_CONCURRENCY", str((os.cpu_count() or 1) * 2 + 1))
+    if name == "gunicorn asgi":
+        env["SERVER_INTERFACE"] = "asgi"
+    return env
+
+
+def _prepare_database(directory):
+    env = _environment(directory, "runserver")
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "-v", "0"], cwd=ROOT, env=env, check=True,
+    )
+    # Los nombres pasan por las mismas validaciones que los formularios: si una
+    # fila se rechaza, los listados medidos quedarían vacíos
+    seed = (
+        "from benchmarks import client_name, setup; setup()\n"
+        "from app.imports import import_rows\n"
+        "from app.models import Client, Product\n"
+        f"import_rows('clients', ({{'name': client_name(i), 'phone': '54221555232',"
+        f" 'email': f'c{{i}}@vetsoft.com', 'city': 'La Plata'}} for i in range({SEED_ROWS})))\n"
+        f"import_rows('products', ({{'name': f'Producto {{i}}', 'type': 'Alimento',"
+        f" 'price': '10'}} for i in range({SEED_ROWS})))\n"
+        "print(Client.objects.count(), Product.objects.count())\n"
+    )
+    counts = subprocess.run(
+        [sys.executable, "-c", seed], cwd=ROOT, env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout.split()
+    if counts != [str(SEED_ROWS)] * 2:
+        raise RuntimeError(f"Se esperaban {SEED_ROWS} clientes y productos, se cargaron {counts}")
+
+
+def _wait_until_listening(process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("El servidor terminó antes de aceptar conexiones")
+        try:
+            with socket.create_connection(("127.0.0.1", PORT), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("El servidor no comenzó a escuchar a tiempo")
+
+
+def _worker(deadline, latencies):
+    requests = 0
+    errors = 0
+    while time.monotonic() < deadline:
+        path = PATHS[requests % len(PATHS)]
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{PORT}{path}", timeout=10) as response:
+                response.read()
+        except OSError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+        requests += 1
+    return requests, errors
+
+
+def run(name, directory, seconds, concurrency):
+    """Levanta el servidor indicado, lo somete a carga y retorna sus métricas"""
+    process = subprocess.Popen(
+        SERVERS[name], cwd=ROOT, env=_environment(directory, name),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_listening(process)
+        latencies = []
+        deadline = time.monotonic() + seconds
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(
+                lambda _: _worker(deadline, latencies), range(concurrency),
+            ))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+    requests = sum(count for count, _ in results)
+    errors = sum(count for _, count in results)
+    cuts = statistics.quantiles(latencies, n=100)
+    return requests / seconds, cuts[49] * 1000, cuts[94] * 1000, errors
+
+
+def main():
+    """Ejecuta la prueba de carga sobre cada servidor e imprime la comparación"""
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    directory = tempfile.mkdtemp()
+    try:
+        _prepare_database(directory)
+        print(f"{seconds} s por servidor, {concurrency} conexiones concurrentes")
+        baseline = None
+        for name in SERVERS:
+            throughput, p50, p95, errors = run(name, directory, seconds, concurrency)
+            baseline = baseline or throughput
+            print(
+                f"{name:14} {throughput:8.1f} req/s  x{throughput / baseline:4.2f}  "
+                f"p50 {p50:6.1f} ms  p95 {p95:6.1f} ms  errores {errors}",
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Mide el costo por petición del context processor del navbar.
+
+Compara la versión anterior (copia de cada enlace y map perezoso) con las
+variantes precalculadas, incluyendo el recorrido de los enlaces que hace la
+plantilla.
+
+Uso: python -m benchmarks.navbar [peticiones por ruta]
+"""
+
+import sys
+import timeit
+
+from benchmarks import setup
+
+setup()
+
+from django.test import RequestFactory  # noqa: E402
+
+from app.context_processors import links, navbar  # noqa: E402
+
+PATHS = ("/", "/clientes/", "/clientes/editar/12/", "/mascotas/nuevo/", "/buscar/")
+
+
+def legacy_navbar(request):
+    """Context processor anterior a las variantes precalculadas (referencia)"""
+    def add_active(link):
+        copy = link.copy()
+
+        if copy["href"] == "/":
+            copy["active"] = request.path == "/"
+        else:
+            copy["active"] = request.path.startswith(copy.get("href", ""))
+
+        return copy
+
+    return {"links": map(add_active, links)}
+
+
+def render_links(processor, request):
+    """Ejecuta el context processor y recorre los enlaces como la plantilla"""
+    for link in processor(request)["links"]:
+        link["active"]
+
+
+def main():
+    """Ejecuta el benchmark e imprime el tiempo por petición de cada versión"""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    requests = [RequestFactory().get(path) for path in PATHS]
+
+    results = {}
+    for name, processor in (("anterior", legacy_navbar), ("precalculado", navbar)):
+        seconds = min(timeit.repeat(
+            lambda: [render_links(processor, request) for request in requests],
+            number=number // len(PATHS), repeat=5,
+        ))
+        results[name] = seconds / number * 1e9
+        print(f"{name:12} {results[name]:8.0f} ns por petición")
+
+    print(f"mejora      x{results['anterior'] / results['precalculado']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
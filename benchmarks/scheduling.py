@@ -0,0 +1,152 @@
+"""
+Mide la búsqueda de turnos libres de todos los veterinarios en un mes.
+
+Carga 50 veterinarios (de 9 a 18) con la mitad de su agenda del mes ocupada
+en una base SQLite temporal y compara:
+
+- una consulta de turnos por veterinario y día, verificando cada horario
+  contra los turnos leídos (lo que haría una vista sin índice),
+- find_free_slots con el índice recién creado (primera lectura completa),
+- find_free_slots con el índice al día (sin escrituras desde la anterior),
+- find_free_slots después de reservar un turno (sincronización incremental).
+
+Uso: python -m benchmarks.scheduling [veterinarios] [días] [repeticiones]
+"""
+
+import datetime
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+DIRECTORY = tempfile.mkdtemp()
+os.environ["SQLITE_PATH"] = os.path.join(DIRECTORY, "db.sqlite3")
+os.environ["REPOSITORY_CACHE_BACKEND"] = "locmem"
+
+from benchmarks import setup  # noqa: E402
+
+setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from app import scheduling  # noqa: E402
+from app.models import APPOINTMENT_MINUTES, Appointment, Breed, Pet, Vet  # noqa: E402
+
+DURATION = datetime.timedelta(minutes=APPOINTMENT_MINUTES)
+
+
+def seed(vets, days):
+    """Crea los veterinarios y ocupa uno de cada dos horarios de cada día"""
+    Vet.objects.bulk_create(
+        Vet(name=f"Veterinario {i}", phone="221555232", email=f"v{i}@vetsoft.com",
+            speciality="General")
+        for i in range(vets)
+    )
+    pet = Pet.objects.create(name="Firulais", breed=Breed.DOG, birthday=datetime.date(2020, 1, 1))
+    first_day = timezone.localdate() + datetime.timedelta(days=1)
+
+    appointments = []
+    for vet in Vet.objects.all():
+        for day in range(days):
+            opening = timezone.make_aware(
+                datetime.datetime.combine(first_day + datetime.timedelta(days=day), vet.opening_time),
+            )
+            for slot in range(0, 18, 2):
+                start = opening + slot * DURATION
+                appointments.append(
+                    Appointment(vet=vet, pet=pet, start=start, end=start + DURATION),
+                )
+    Appointment.objects.bulk_create(appointments, batch_size=1000)
+    # Como si la agenda se hubiera cargado antes de levantar el proceso
+    Appointment.objects.update(updated_at=timezone.now() - datetime.timedelta(days=1))
+    return pet, first_day, first_day + datetime.timedelta(days=days - 1)
+
+
+def naive_free_slots(date_from, date_to):
+    """Busca los turnos libres consultando la base por cada veterinario y día"""
+    slots = []
+    now = timezone.now()
+    for vet in Vet.objects.order_by("pk"):
+        day = date_from
+        while day <= date_to:
+            slot = timezone.make_aware(datetime.datetime.combine(day, vet.opening_time))
+            day_end = timezone.make_aware(datetime.datetime.combine(day, vet.closing_time))
+            busy = list(
+                Appointment.objects.filter(vet=vet, start__lt=day_end, end__gt=slot)
+                .values_list("start", "end"),
+            )
+            while slot + DURATION <= day_end:
+                slot_end = slot + DURATION
+                if slot >= now and not any(start < slot_end and end > slot for start, end in busy):
+                    slots.append(scheduling.Slot(vet.pk, slot, slot_end))
+                slot = slot_end
+            day += datetime.timedelta(days=1)
+    return slots
+
+
+def measure(function, repetitions, before=None):
+    """Retorna la mediana en milisegundos y el resultado de la última llamada"""
+    latencies = []
+    for _ in range(repetitions):
+        if before:
+            before()
+        start = time.perf_counter()
+        result = function()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000, result
+
+
+def main():
+    """Ejecuta el benchmark e imprime la latencia de cada variante"""
+    vets = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 31
+    repetitions = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    try:
+        call_command("migrate", verbosity=0)
+        pet, date_from, date_to = seed(vets, days)
+        print(
+            f"{vets} veterinarios, {days} días, {Appointment.objects.count()} turnos, "
+            f"mediana de {repetitions} búsquedas",
+        )
+
+        def search():
+            return scheduling.find_free_slots(date_from, date_to)
+
+        def reset():
+            scheduling.availability = scheduling.AvailabilityIndex()
+
+        booked = iter(range(10**6))
+
+        def book():
+            # Reserva el último horario de algún día (siempre libre)
+            index = next(booked)
+            day = date_from + datetime.timedelta(days=index % days)
+            vet = Vet.objects.get(pk=index // days % vets + 1)
+            start = timezone.make_aware(
+                datetime.datetime.combine(day, vet.closing_time),
+            ) - DURATION * (1 + index // (days * vets) * 2)
+            Appointment.objects.create(vet=vet, pet=pet, start=start, end=start + DURATION)
+
+        naive, expected = measure(lambda: naive_free_slots(date_from, date_to), repetitions)
+        cold, result = measure(search, repetitions, before=reset)
+        assert sorted(result) == sorted(expected)
+        warm, _ = measure(search, repetitions)
+        incremental, _ = measure(search, repetitions, before=book)
+
+        print(f"{'consulta por veterinario y día':34} {naive:9.1f} ms  ({len(expected)} libres)")
+        for label, latency in (
+            ("índice, primera lectura", cold),
+            ("índice al día", warm),
+            ("índice, después de reservar", incremental),
+        ):
+            print(f"{label:34} {latency:9.1f} ms  x{naive / latency:.0f}")
+    finally:
+        shutil.rmtree(DIRECTORY)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compara los perfiles de SQLite con lectores y escritores concurrentes.
+
+Cada perfil corre sobre su propia base temporal: varios procesos leen la
+primera página de productos mientras otros crean y modifican productos como lo
+hacen los formularios. Se informan operaciones por segundo y cuántas fallaron
+con "database is locked".
+
+Uso: python -m benchmarks.sqlite_concurrency [segundos] [lectores] [escritores]
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROFILES = ("default", "tuned")
+
+
+def _environment(directory, profile):
+    return {
+        **os.environ,
+        "SQLITE_PATH": os.path.join(directory, f"{profile}.sqlite3"),
+        "SQLITE_PROFILE": profile,
+        "REPOSITORY_CACHE_BACKEND": "dummy",
+    }
+
+
+def _worker(role, env, seconds, results):
+    os.environ.update(env)
+
+    from benchmarks import setup
+
+    setup()
+
+    from django.db import OperationalError, connection
+
+    from app.models import Product
+
+    done = 0
+    locked = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if role == "reader":
+                list(Product.objects.order_by("id")[:51])
+            else:
+                Product.save_product({"name": "Collar", "type": "Accesorio", "price": "10"})
+                product = Product.objects.order_by("-id").first()
+                product.update_product({"name": "Correa", "type": "Accesorio", "price": "12"})
+            done += 1
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            locked += 1
+
+    connection.close()
+    results.put((role, done, locked))
+
+
+def run(profile, directory, seconds, readers, writers):
+    """Ejecuta la carga concurrente sobre un perfil y retorna sus totales"""
+    env = _environment(directory, profile)
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "-v", "0"], cwd=ROOT, env=env, check=True,
+    )
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(role, env, seconds, results))
+        for role in ["reader"] * readers + ["writer"] * writers
+    ]
+    for process in processes:
+        process.start()
+
+    totals = {"reader": [0, 0], "writer": [0, 0]}
+    for _ in processes:
+        role, done, locked = results.get()
+        totals[role][0] += done
+        totals[role][1] += locked
+    for process in processes:
+        process.join()
+
+    return totals
+
+
+def main():
+    """Ejecuta el benchmark para cada perfil e imprime la comparación"""
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    writers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{seconds} s por perfil, {readers} lectores, {writers} escritores")
+        for profile in PROFILES:
+            totals = run(profile, directory, seconds, readers, writers)
+            (reads, read_locks), (writes, write_locks) = totals["reader"], totals["writer"]
+            print(
+                f"{profile:8} lecturas {reads / seconds:8.1f}/s  "
+                f"escrituras {writes / seconds:7.1f}/s  "
+                f"database is locked: {read_locks + write_locks}",
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Mide ventas concurrentes de un mismo producto con dos formas de descontar stock.
+
+Varios procesos venden una unidad a la vez del mismo producto sobre una base
+SQLite temporal (perfil "tuned", con WAL y busy_timeout):
+
+- "leer y guardar": lee el producto, resta en Python, guarda y registra el
+  movimiento (lo que haría una vista ingenua); entre la lectura y el guardado
+  otra venta puede pisar el valor, y esas ventas se pierden,
+- "F()": Product.move_stock, un UPDATE atómico que resta sobre el valor vigente.
+
+Se informan ventas por segundo, ventas perdidas (vendidas menos descontadas) y
+reintentos por "database is locked".
+
+Uso: python -m benchmarks.stock [procesos] [ventas por proceso]
+"""
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STRATEGIES = ("leer y guardar", "F()")
+
+INITIAL_STOCK = 10**6
+
+
+def _worker(strategy, env, sales, start, results):
+    os.environ.update(env)
+
+    from benchmarks import setup
+
+    setup()
+
+    from django.db import OperationalError, connection
+
+    from app.models import Product, StockMovement
+
+    product_id = Product.objects.get().pk
+    sold = 0
+    locked = 0
+    start.wait()
+    while sold < sales:
+        try:
+            if strategy == "F()":
+                Product.move_stock(product_id, -1)
+            else:
+                product = Product.objects.get(pk=product_id)
+                product.stock -= 1
+                product.save()
+                StockMovement.objects.create(product=product, quantity=-1)
+            sold += 1
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            locked += 1
+
+    connection.close()
+    results.put(locked)
+
+
+def run(strategy, directory, processes, sales):
+    """Ejecuta las ventas concurrentes de una estrategia y retorna sus totales"""
+    env = {
+        **os.environ,
+        "SQLITE_PATH": os.path.join(directory, f"{STRATEGIES.index(strategy)}.sqlite3"),
+        "SQLITE_PROFILE": "tuned",
+        "REPOSITORY_CACHE_BACKEND": "dummy",
+    }
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "-v", "0"], cwd=ROOT, env=env, check=True,
+    )
+    subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c",
+         "from app.models import Product; "
+         f"Product.objects.create(name='Collar', type='Accesorio', price=10, stock={INITIAL_STOCK})"],
+        cwd=ROOT, env=env, check=True,
+    )
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start = context.Event()
+    workers = [
+        context.Process(target=_worker, args=(strategy, env, sales, start, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    # Da tiempo a que todos los procesos carguen Django antes de empezar
+    time.sleep(3)
+    began = time.perf_counter()
+    start.set()
+    locked = sum(results.get() for _ in workers)
+    elapsed = time.perf_counter() - began
+    for worker in workers:
+        worker.join()
+
+    stock = subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c",
+         "from app.models import Product; print(Product.objects.get().stock)"],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    sold = processes * sales
+    return sold / elapsed, sold - (INITIAL_STOCK - int(stock)), locked
+
+
+def main():
+    """Ejecuta el benchmark e imprime el resultado de cada estrategia"""
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    sales = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{processes} procesos x {sales} ventas del mismo producto")
+        for strategy in STRATEGIES:
+            throughput, lost, locked = run(strategy, directory, processes, sales)
+            print(
+                f"{strategy:15} {throughput:8.0f} ventas/s  "
+                f"perdidas {lost:5}  reintentos {locked}",
+            )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compara el motor de validación con los validadores anteriores.
+
+Uso: python -m benchmarks.validation [cantidad de filas]
+"""
+
+import re
+import sys
+import timeit
+
+from benchmarks import setup
+
+setup()
+
+from app.models import CLIENT_SCHEMA, PRODUCT_SCHEMA  # noqa: E402
+
+
+def legacy_validate_client(data):
+    """Validador de clientes anterior al motor declarativo (referencia)"""
+    errors = {}
+
+    name = data.get("name", "")
+    phone = data.get("phone", "")
+    email = data.get("email", "")
+    city = data.get("city", "")
+
+    if not name.strip():
+        errors["name"] = "El nombre no puede estar vacío o contener solo espacios"
+    elif not re.match("^[a-zA-Z ]+$", name):
+        errors["name"] = "El nombre solo puede contener letras y espacios"
+
+    if phone == "":
+        errors["phone"] = "Por favor ingrese un teléfono"
+    elif len(re.findall("^54", phone)) == 0:
+        errors["phone"] = "El teléfono debe comenzar con 54"
+    elif not phone.isdigit():
+        errors["phone"] = "Por favor ingrese un teléfono valido"
+    elif int(phone) <= 0:
+        errors["phone"] = "El número debe ser positivo"
+
+    if email == "":
+        errors["email"] = "Por favor ingrese un email"
+    elif "@" not in email:
+        errors["email"] = "El email debe contener @"
+    else:
+        try:
+            local_part, domain_part = email.rsplit("@", 1)
+            if domain_part != "vetsoft.com":
+                errors["email"] = "Por favor el email debe ser del dominio @vetsoft.com"
+            elif local_part == "":
+                errors["email"] = "Por favor el email debe tener una parte local antes de @vetsoft.com"
+        except ValueError:
+            errors["email"] = "Por favor ingrese un email válido"
+
+    if city == "":
+        errors["city"] = "Por favor ingrese una ciudad"
+    elif not (city == "La Plata" or city == "Berisso" or city == "Ensenada"):
+        errors["city"] = "Por favor ingrese una ciudad válida"
+
+    return errors
+
+
+def legacy_isfloat(num):
+    """Función isfloat anterior (referencia)"""
+    try:
+        float(num)
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_validate_product(data):
+    """Validador de productos anterior al motor declarativo (referencia)"""
+    errors = {}
+
+    name = data.get("name", "")
+    type = data.get("type", "")
+    price = data.get("price", "")
+
+    if name == "":
+        errors["name"] = "Por favor ingrese un nombre"
+
+    if type == "":
+        errors["type"] = "Por favor ingrese un tipo del producto"
+
+    if price == "":
+        errors["price"] = "Por favor ingrese un precio"
+    elif not legacy_isfloat(price):
+        errors["price"] = "Por favor ingrese un precio"
+    elif float(price) <= 0:
+        errors["price"] = "El precio debe ser mayor a cero"
+
+    return errors
+
+
+def client_rows(count):
+    """Genera filas de clientes, una de cada diez inválida"""
+    return [
+        {
+            "name": "Juan Perez" if i % 10 else "Juan 2",
+            "phone": f"54221{i:06d}",
+            "email": f"cliente{i}@vetsoft.com",
+            "city": "Berisso",
+        }
+        for i in range(count)
+    ]
+
+
+def product_rows(count):
+    """Genera filas de productos, una de cada diez inválida"""
+    return [
+        {"name": "Collar", "type": "Accesorio", "price": str(i % 100 + (0 if i % 10 else -200))}
+        for i in range(count)
+    ]
+
+
+def measure(label, function, repeat=5):
+    """Ejecuta la función varias veces e imprime el mejor tiempo"""
+    best = min(timeit.repeat(function, number=1, repeat=repeat))
+    print(f"  {label:<28} {best * 1000:8.1f} ms")
+    return best
+
+
+def main():
+    """Ejecuta el benchmark e imprime los tiempos y la mejora relativa"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for name, rows, legacy, schema in [
+        ("clientes", client_rows(count), legacy_validate_client, CLIENT_SCHEMA),
+        ("productos", product_rows(count), legacy_validate_product, PRODUCT_SCHEMA),
+    ]:
+        print(f"{name} ({count} filas)")
+        base = measure("validador anterior", lambda: [legacy(row) for row in rows])
+        single = measure("esquema, fila por fila", lambda: [schema.validate(row) for row in rows])
+        batch = measure("esquema, validate_batch", lambda: schema.validate_batch(rows))
+        print(f"  mejora: {base / single:.2f}x por fila, {base / batch:.2f}x por lote")
+
+
+if __name__ == "__main__":
+    main()
@@ -170,17 +170,15 @@ class ClientsRepoTestCase(PlaywrightTestCase):
 
         self.page.goto(f"{self.live_server_url}{reverse('clients_repo')}")
 
-        edit_form = self.page.get_by_role(
-            "form", name="Formulario de eliminación de cliente"
-        )
-        client_id_input = edit_form.locator("input[name=client_id]")
+        delete_form = self.page.locator("form#clients-delete")
+        delete_button = self.page.get_by_role("button", name="Eliminar")
 
-        expect(edit_form).to_be_visible()
-        expect(edit_form).to_have_attribute(
+        expect(delete_form).to_have_attribute(
             "action", reverse("clients_delete"))
-        expect(client_id_input).not_to_be_visible()
-        expect(client_id_input).to_have_value(str(client.id))
-        expect(edit_form.get_by_role("button", name="Eliminar")).to_be_visible()
+        expect(delete_button).to_be_visible()
+        expect(delete_button).to_have_attribute("form", "clients-delete")
+        expect(delete_button).to_have_attribute("name", "client_id")
+        expect(delete_button).to_have_attribute("value", str(client.id))
 
     def test_should_can_be_able_to_delete_a_client(self):
         Client.objects.create(
@@ -0,0 +1,59 @@
+"""
+Configuración de gunicorn para producción.
+
+Uso: gunicorn -c gunicorn.conf.py
+
+Variables de entorno:
+- PORT: puerto donde escucha el servidor (8000).
+- SERVER_INTERFACE: "wsgi" (vetsoft/wsgi.py, por defecto) o "asgi"
+  (vetsoft/asgi.py con workers de uvicorn y las vistas asíncronas).
+- WEB_CONCURRENCY: cantidad de procesos (2 × CPUs + 1).
+- GUNICORN_THREADS: hilos por proceso en modo WSGI (1 usa workers sync).
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT: segundos antes de reiniciar un
+  worker colgado / para terminar las peticiones en curso al apagar.
+"""
+
+import multiprocessing
+import os
+
+interface = os.environ.get("SERVER_INTERFACE", "wsgi")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+if interface == "asgi":
+    wsgi_app = "vetsoft.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    # Con ASGI se usan las vistas asíncronas salvo que se indique lo contrario
+    os.environ.setdefault("ASYNC_VIEWS", "1")
+else:
+    wsgi_app = "vetsoft.wsgi:application"
+    worker_class = "gthread" if threads > 1 else "sync"
+
+# Django se carga una vez en el proceso maestro y los workers comparten esa
+# memoria copy-on-write; cada worker abre sus propias conexiones a la base.
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Reinicia los workers periódicamente para acotar fugas de memoria
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+# La caché de listados en memoria es propia de cada proceso: con varios
+# workers se usa el backend de archivos para que la invalidación llegue a todos.
+if workers > 1:
+    os.environ.setdefault("REPOSITORY_CACHE_BACKEND", "file")
+
+
+def post_fork(server, worker):
+    """Descarta las conexiones a la base heredadas del proceso maestro"""
+    from django.db import connections
+
+    connections.close_all()
@@ -15,7 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-urlpatterns = [path("admin/", admin.site.urls), path("", include("app.urls"))]
+# Con ASYNC_VIEWS las vistas de la aplicación son las asíncronas (app/urls_async.py)
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("", include("app.urls_async" if settings.ASYNC_VIEWS else "app.urls")),
+]